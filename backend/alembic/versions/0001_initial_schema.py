@@ -0,0 +1,88 @@
+"""initial schema
+
+既存の users / projects / tasks テーブル
+（マイグレーション導入前に作成済みのDBは `alembic stamp 0001` で適用済みにする）
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("client_name", sa.String(length=100), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("priority", sa.String(length=20), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("budget", sa.DECIMAL(precision=10, scale=2), nullable=True),
+        sa.Column("repository_url", sa.String(length=500), nullable=True),
+        sa.Column("demo_url", sa.String(length=500), nullable=True),
+        sa.Column("tech_stack", sa.ARRAY(sa.Text()).with_variant(sa.JSON(), "sqlite"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+    op.create_index("ix_projects_title", "projects", ["title"])
+    op.create_index("ix_projects_status", "projects", ["status"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("assigned_to", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("priority", sa.String(length=20), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("estimated_hours", sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column("actual_hours", sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_to"], ["users.id"]),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+    op.create_index("ix_tasks_title", "tasks", ["title"])
+    op.create_index("ix_tasks_status", "tasks", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_table("users")
@@ -0,0 +1,84 @@
+"""query indexes
+
+ルーターのクエリ形状に合わせた複合・部分インデックス
+- projects: (user_id, status, priority) の絞り込み、
+  (user_id, COALESCE(updated_at, created_at) DESC, id DESC) の一覧順
+- tasks: (project_id, [status,] created_at, id) の絞り込み・一覧順
+  （project_id の外部キー検索・カスケード削除にも使用）
+- tasks: assigned_to（外部キー）、未完了タスクの期日（期限切れ集計）
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（PostgreSQL）
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_projects_user_status_priority",
+            "projects",
+            ["user_id", "status", "priority"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_projects_user_sort_key",
+            "projects",
+            [
+                "user_id",
+                sa.text("COALESCE(updated_at, created_at) DESC"),
+                sa.text("id DESC"),
+            ],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_project_created",
+            "tasks",
+            ["project_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_project_status_created",
+            "tasks",
+            ["project_id", "status", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_assigned_to",
+            "tasks",
+            ["assigned_to"],
+            postgresql_where=sa.text("assigned_to IS NOT NULL"),
+            sqlite_where=sa.text("assigned_to IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_project_open_due",
+            "tasks",
+            ["project_id", "due_date"],
+            postgresql_where=sa.text("status <> 'completed'"),
+            sqlite_where=sa.text("status <> 'completed'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_project_open_due", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_assigned_to", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_project_status_created", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_project_created", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_projects_user_sort_key", table_name="projects", postgresql_concurrently=True)
+        op.drop_index("ix_projects_user_status_priority", table_name="projects", postgresql_concurrently=True)
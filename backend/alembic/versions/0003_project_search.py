@@ -0,0 +1,76 @@
+"""project full-text search
+
+projects.search_vector（tsvector）をトリガーで自動更新し、GINインデックスで検索
+対象: title (A), client_name / tech_stack (B), description (C)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce({row}client_name, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(array_to_string({row}tech_stack, ' '), '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({row}description, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects",
+        sa.Column("search_vector", postgresql.TSVECTOR().with_variant(sa.Text(), "sqlite"), nullable=True),
+    )
+    if op.get_bind().dialect.name != "postgresql":
+        # PostgreSQL 以外では列のみ作成（検索はアプリ側の転置インデックスで行う）
+        return
+
+    op.execute(f"""
+        CREATE FUNCTION projects_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER projects_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, client_name, tech_stack
+        ON projects
+        FOR EACH ROW EXECUTE FUNCTION projects_search_vector_update()
+    """)
+
+    # 既存データのバックフィル
+    op.execute(f"UPDATE projects SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')}")
+
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_projects_search_vector",
+            "projects",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index("ix_projects_search_vector", table_name="projects", postgresql_concurrently=True)
+        op.execute("DROP TRIGGER IF EXISTS projects_search_vector_trigger ON projects")
+        op.execute("DROP FUNCTION IF EXISTS projects_search_vector_update()")
+    op.drop_column("projects", "search_vector")
@@ -0,0 +1,45 @@
+"""project task counters
+
+案件ごとのタスク件数カウンタ（非正規化）と既存データの集計
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_STATUSES = ("todo", "in_progress", "completed", "blocked")
+COUNTER_COLUMNS = ("task_total",) + tuple(f"task_{status}" for status in TASK_STATUSES)
+
+
+def upgrade() -> None:
+    for column in COUNTER_COLUMNS:
+        op.add_column(
+            "projects",
+            sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+        )
+
+    # 既存タスクから集計
+    assignments = ["task_total = (SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id)"]
+    assignments += [
+        f"task_{status} = (SELECT count(*) FROM tasks "
+        f"WHERE tasks.project_id = projects.id AND tasks.status = '{status}')"
+        for status in TASK_STATUSES
+    ]
+    op.execute(f"UPDATE projects SET {', '.join(assignments)}")
+
+
+def downgrade() -> None:
+    for column in reversed(COUNTER_COLUMNS):
+        op.drop_column("projects", column)
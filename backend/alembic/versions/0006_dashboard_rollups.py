@@ -0,0 +1,79 @@
+"""dashboard rollups
+
+ユーザーごとのダッシュボード集計（差分で更新、毎晩再集計）と既存データの集計
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROJECT_STATUSES = ("planning", "in_progress", "completed", "on_hold", "cancelled")
+TASK_STATUSES = ("todo", "in_progress", "completed", "blocked")
+
+
+def counter(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), server_default="0", nullable=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        counter("projects_total"),
+        *(counter(f"projects_{status}") for status in PROJECT_STATUSES),
+        counter("projects_overdue"),
+        counter("tasks_total"),
+        *(counter(f"tasks_{status}") for status in TASK_STATUSES),
+        counter("tasks_overdue"),
+        sa.Column("budget_total", sa.DECIMAL(14, 2), server_default="0", nullable=False),
+        sa.Column("estimated_hours_total", sa.DECIMAL(12, 2), server_default="0", nullable=False),
+        sa.Column("actual_hours_total", sa.DECIMAL(12, 2), server_default="0", nullable=False),
+        sa.Column("overdue_as_of", sa.Date(), server_default=sa.text("CURRENT_DATE"), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # 既存の案件・タスクから集計
+    projects = "FROM projects WHERE projects.user_id = users.id"
+    tasks = "FROM tasks JOIN projects ON projects.id = tasks.project_id WHERE projects.user_id = users.id"
+    values = {
+        "projects_total": f"(SELECT count(*) {projects})",
+        "projects_overdue": (
+            f"(SELECT count(*) {projects} AND projects.end_date < CURRENT_DATE "
+            "AND projects.status NOT IN ('completed', 'cancelled'))"
+        ),
+        "budget_total": f"COALESCE((SELECT sum(projects.budget) {projects}), 0)",
+        "tasks_total": f"(SELECT count(*) {tasks})",
+        "tasks_overdue": (
+            f"(SELECT count(*) {tasks} AND tasks.due_date < CURRENT_DATE "
+            "AND tasks.status <> 'completed')"
+        ),
+        "estimated_hours_total": f"COALESCE((SELECT sum(tasks.estimated_hours) {tasks}), 0)",
+        "actual_hours_total": f"COALESCE((SELECT sum(tasks.actual_hours) {tasks}), 0)",
+    }
+    for status in PROJECT_STATUSES:
+        values[f"projects_{status}"] = f"(SELECT count(*) {projects} AND projects.status = '{status}')"
+    for status in TASK_STATUSES:
+        values[f"tasks_{status}"] = f"(SELECT count(*) {tasks} AND tasks.status = '{status}')"
+
+    op.execute(
+        f"INSERT INTO dashboard_rollups (user_id, {', '.join(values)}) "
+        f"SELECT users.id, {', '.join(values.values())} FROM users"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_rollups")
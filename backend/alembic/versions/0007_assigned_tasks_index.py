@@ -0,0 +1,48 @@
+"""assigned tasks index
+
+担当タスク一覧（GET /tasks/assigned）用の (assigned_to, status, due_date, id) インデックス
+担当者の外部キー検索も兼ねるため、assigned_to 単独のインデックスは置き換える
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（PostgreSQL）
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_assigned_status_due",
+            "tasks",
+            ["assigned_to", "status", "due_date", "id"],
+            postgresql_where=sa.text("assigned_to IS NOT NULL"),
+            sqlite_where=sa.text("assigned_to IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_tasks_assigned_to", table_name="tasks", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_assigned_to",
+            "tasks",
+            ["assigned_to"],
+            postgresql_where=sa.text("assigned_to IS NOT NULL"),
+            sqlite_where=sa.text("assigned_to IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_tasks_assigned_status_due", table_name="tasks", postgresql_concurrently=True)
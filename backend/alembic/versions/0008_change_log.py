@@ -0,0 +1,42 @@
+"""change log
+
+差分同期（GET /sync）用の変更履歴（同期トークン = seq、削除のトゥームストーンを含む）
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("seq"),
+    )
+    op.create_index("ix_change_log_user_seq", "change_log", ["user_id", "seq"])
+    op.create_index("ix_change_log_changed_at", "change_log", ["changed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_change_log_changed_at", table_name="change_log")
+    op.drop_index("ix_change_log_user_seq", table_name="change_log")
+    op.drop_table("change_log")
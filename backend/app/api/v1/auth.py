@@ -3,39 +3,44 @@
 ユーザー登録、ログイン
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
+from app.models.dashboard_rollup import DashboardRollup
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.auth import Token, LoginRequest
+from app.schemas.auth import Token, LoginRequest, RefreshRequest, Principal
 from app.core.security import (
-    verify_password,
-    get_password_hash,
-    create_access_token,
+    verify_and_update_password_async,
+    get_password_hash_async,
+    decode_access_token,
 )
-from app.core.deps import get_current_user
-from app.config import settings
+from app.core.deps import get_current_user, get_current_principal, oauth2_scheme
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import login_rate_limiter
+from app.core.revocation import token_revocations
+from app.services import auth_tokens
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     ユーザー登録
     """
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="このメールアドレスは既に登録されています"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -44,36 +49,106 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    db.add(DashboardRollup(user=new_user))
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     ログイン（OAuth2 Password Flow）
+    IP・メールアドレスごとの試行回数を超えた場合は DB参照・照合を行わず 429
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = await login_rate_limiter.check(client_ip, form_data.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="ログイン試行回数が上限を超えました。しばらくしてから再度お試しください",
+            headers={"Retry-After": str(retry_after)},
+        )
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
+    
+    verified, new_hash = (
+        await verify_and_update_password_async(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="メールアドレスまたはパスワードが正しくありません",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id, "email": user.email},
-        expires_delta=access_token_expires
-    )
+    # ハッシュの方式・コストが現在の設定と異なる場合は再ハッシュして保存
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
+    await login_rate_limiter.reset_email(form_data.username)
+    
+    return await auth_tokens.issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(request_data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    トークン更新（リフレッシュトークンのローテーション）
+    使用済みのリフレッシュトークンが再利用された場合は同じ系列をすべて失効
+    """
+    tokens = await auth_tokens.rotate_refresh_token(db, request_data.refresh_token)
+    
+    if tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="リフレッシュトークンが無効です",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return tokens
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request_data: RefreshRequest,
+    token: str = Depends(oauth2_scheme),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    ログアウト（このアクセストークンとリフレッシュトークンの系列を失効）
+    """
+    payload = decode_access_token(token) or {}
+    if payload.get("jti"):
+        await token_revocations.revoke_token(payload["jti"], expires_at=payload.get("exp"))
+    await auth_tokens.revoke_refresh_token(db, request_data.refresh_token, current_user.id)
+    
+    return None
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    全端末からログアウト（発行済みのアクセストークン・リフレッシュトークンをすべて失効）
+    """
+    token_version = await auth_tokens.revoke_all_tokens(db, current_user.id)
+    await token_revocations.revoke_user(current_user.id, token_version)
+    await principal_cache.invalidate(current_user.id)
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return None
 
 
 @router.get("/me", response_model=UserResponse)
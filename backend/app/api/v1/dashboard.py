@@ -0,0 +1,34 @@
+"""
+ダッシュボードAPI
+ユーザーごとの集計（dashboard_rollups）を返す
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas.auth import Principal
+from app.schemas.dashboard import DashboardResponse
+from app.core.deps import get_current_principal
+from app.core.etag import check_etag
+from app.services import dashboard as dashboard_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=DashboardResponse,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(check_etag)],
+)
+async def get_dashboard(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    ダッシュボード取得
+    案件・タスクのステータス別件数、期限切れ件数、予算・工数の合計を主キー1件の読み取りで返す
+    （集計行がない場合のみ再集計して作成するため、プライマリで読む）
+    """
+    return await dashboard_service.get_dashboard(db, current_user.id)
@@ -0,0 +1,137 @@
+"""
+変更通知API
+案件・タスクの変更イベントを Server-Sent Events / WebSocket で配信
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.schemas.auth import Principal
+from app.core.deps import get_stream_principal, principal_from_connection
+from app.core.events import RESET, Subscription, change_broker, event_ids
+
+router = APIRouter()
+
+# クライアントの再接続間隔（ミリ秒、SSE の retry）
+SSE_RETRY_MS = 3000
+
+# WebSocket の生存確認（SSE のコメント行に相当）
+PING = {"type": "ping"}
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="イベントIDが不正です"
+        )
+
+
+async def _subscribe(user_id: int, last_event_id: Optional[int]) -> Subscription:
+    latest = await event_ids.latest(user_id) if last_event_id is not None else None
+    return change_broker.subscribe(user_id, last_event_id, latest)
+
+
+def _format_sse(item: dict) -> bytes:
+    if item is RESET:
+        return b"event: reset\ndata: {}\n\n"
+    return b"id: %d\nevent: change\ndata: %s\n\n" % (item["id"], orjson.dumps(item))
+
+
+async def _sse_stream(user_id: int, last_event_id: Optional[int]) -> AsyncIterator[bytes]:
+    # 応答の送信開始前に切断されてもキューが残らないよう、購読はジェネレーター内で行う
+    subscription = await _subscribe(user_id, last_event_id)
+    try:
+        yield b"retry: %d\n\n" % SSE_RETRY_MS
+        while True:
+            item = await subscription.get(settings.EVENT_HEARTBEAT_SECONDS)
+            if item is None:
+                # 中継サーバー・ブラウザに切断されないためのコメント行
+                yield b": keep-alive\n\n"
+                continue
+            yield _format_sse(item)
+            if item is RESET:
+                # 再同期を求めて切断（クライアントは一覧を取り直して再接続する）
+                return
+    finally:
+        change_broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    last_event_id: Optional[str] = Header(None),
+    last_event_id_query: Optional[str] = Query(None, alias="last_event_id"),
+    current_user: Principal = Depends(get_stream_principal),
+):
+    """
+    変更イベントの購読（Server-Sent Events）
+    Last-Event-ID ヘッダー（または last_event_id クエリ）以降のイベントを再送してから配信を続ける
+    再送できない場合・配信が追いつかない場合は reset イベントを送って切断する
+    """
+    resume_from = _parse_event_id(last_event_id or last_event_id_query)
+    return StreamingResponse(
+        _sse_stream(current_user.id, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    access_token: Optional[str] = None,
+    last_event_id: Optional[str] = None,
+):
+    """
+    変更イベントの購読（WebSocket）
+    SSE と同じイベントを JSON で送信し、reset 送信後は切断する
+    イベントがない間は EVENT_HEARTBEAT_SECONDS ごとに ping を送る
+    """
+    try:
+        current_user = await principal_from_connection(websocket, access_token)
+        resume_from = _parse_event_id(last_event_id)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = await _subscribe(current_user.id, resume_from)
+
+    async def wait_disconnect():
+        # クライアントからのメッセージは使わず、切断の検知のみ行う
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    receiver = asyncio.create_task(wait_disconnect())
+    try:
+        while not receiver.done():
+            getter = asyncio.create_task(subscription.get(settings.EVENT_HEARTBEAT_SECONDS))
+            await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                break
+            item = getter.result()
+            if item is None:
+                # 中継サーバーに切断されず、切れた接続を送信エラーで検知できるよう ping を送る
+                await websocket.send_text(orjson.dumps(PING).decode())
+                continue
+            await websocket.send_text(orjson.dumps(item).decode())
+            if item is RESET:
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        change_broker.unsubscribe(subscription)
@@ -0,0 +1,125 @@
+"""
+エクスポートAPI
+案件・タスクを NDJSON / CSV でストリーミング出力
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from typing import AsyncIterator, List, Literal, Union
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.database import SessionLocal
+from app.models.project import Project
+from app.models.task import Task
+from app.schemas.auth import Principal
+from app.schemas.project import ProjectResponse
+from app.schemas.task import TaskResponse
+from app.core.deps import get_current_principal
+from app.core.responses import dumps
+
+router = APIRouter()
+
+# サーバーサイドカーソルで一度に取得する行数
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# 出力列（レスポンススキーマと同じ項目）
+PROJECT_COLUMNS = list(ProjectResponse.model_fields)
+TASK_COLUMNS = list(TaskResponse.model_fields)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ";".join(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(columns: List[str], rows) -> bytes:
+    return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def _stream_rows(
+    query: Select,
+    columns: List[str],
+    export_format: str,
+) -> AsyncIterator[Union[str, bytes]]:
+    """
+    サーバーサイドカーソルで EXPORT_BATCH_SIZE 行ずつ読み出してエンコード
+    レスポンス送信中も使えるよう、リクエストとは別のセッションを使用
+    """
+    if export_format == "csv":
+        yield _encode_csv([columns])
+
+    async with SessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(columns, rows)
+
+
+def _export_response(
+    query: Select,
+    columns: List[str],
+    export_format: str,
+    name: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_rows(query, columns, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@router.get("/projects")
+async def export_projects(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    案件エクスポート
+    """
+    query = (
+        select(*[getattr(Project, name) for name in PROJECT_COLUMNS])
+        .where(Project.user_id == current_user.id)
+        .order_by(Project.id)
+    )
+    return _export_response(query, PROJECT_COLUMNS, format, "projects")
+
+
+@router.get("/tasks")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    タスクエクスポート（全案件）
+    """
+    query = (
+        select(*[getattr(Task, name) for name in TASK_COLUMNS])
+        .join(Task.project)
+        .where(Project.user_id == current_user.id)
+        .order_by(Task.project_id, Task.id)
+    )
+    return _export_response(query, TASK_COLUMNS, format, "tasks")
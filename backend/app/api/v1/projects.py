@@ -3,64 +3,150 @@
 CRUD操作
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Literal, Optional
 
 from app.database import get_db
 from app.models.project import Project
-from app.models.user import User
+from app.models.task import Task
+from app.schemas.auth import Principal
 from app.schemas.project import (
     ProjectCreate,
     ProjectResponse,
     ProjectUpdate,
     ProjectStats,
+    ProjectDetailResponse,
 )
-from app.core.deps import get_current_user
+from app.core.deps import get_current_principal, get_read_db
+from app.core.etag import check_etag
+from app.core.events import record_change
+from app.core.response_cache import response_cache
+from app.core.responses import json_response, model_columns, parse_fields, rows_to_dicts
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_condition, split_page
+from app.services import search as search_service
+from app.services import dashboard as dashboard_service
+from app.services import stats as stats_service
+from app.services.dashboard import PROJECT_FIELDS, snapshot
+from app.services.task_counters import TASK_COUNT_FIELDS
 
 router = APIRouter()
 
+# 一覧の並び順（更新日時は初回更新まで NULL のため作成日時で補完し、id で一意化）
+PROJECT_SORT_KEY = func.coalesce(Project.updated_at, Project.created_at)
 
-@router.get("/", response_model=List[ProjectResponse])
+# ページ分割（次ページのカーソル作成）に必要な項目
+PROJECT_KEY_FIELDS = ("updated_at", "created_at", "id")
+
+# 案件詳細に同梱できる関連データ
+PROJECT_INCLUDES = ("tasks", "stats")
+
+
+def _parse_include(include: Optional[str]) -> List[str]:
+    """
+    include パラメータ（カンマ区切り）を検証
+    """
+    if not include:
+        return []
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROJECT_INCLUDES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include に指定できない値です: {', '.join(unknown)}"
+        )
+    return names
+
+
+@router.get("/", response_model=List[ProjectResponse], dependencies=[Depends(check_etag)])
 async def get_projects(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
     priority: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、例: id,title,status,priority）"),
+    include_counts: bool = Query(False, description="タスク件数・進捗率を含める"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     案件一覧取得
+    cursor 指定時はキーセット方式、未指定時は skip/limit 方式
+    次ページのカーソルは X-Next-Cursor ヘッダーで返す
+    search 指定時はタイトル・説明・クライアント名・技術スタックを全文検索（関連度順）
+    fields 指定時は指定項目（と id）の列のみ取得して返す
+    include_counts=true でタスク件数・進捗率を含める（案件行のカウンタ列のため追加クエリなし）
     """
-    query = db.query(Project).filter(Project.user_id == current_user.id)
+    names = parse_fields(fields, ProjectResponse, optional=TASK_COUNT_FIELDS)
+    if include_counts:
+        names += [name for name in TASK_COUNT_FIELDS if name not in names]
+    select_names = names + [name for name in PROJECT_KEY_FIELDS if name not in names]
     
-    if status:
-        query = query.filter(Project.status == status)
+    # 応答項目の列のみ取得し、行ごとの Pydantic 検証を省略して orjson で返す
+    query = select(*model_columns(Project, select_names)).where(Project.user_id == current_user.id)
+    
+    if status_filter:
+        query = query.where(Project.status == status_filter)
     
     if priority:
-        query = query.filter(Project.priority == priority)
+        query = query.where(Project.priority == priority)
     
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (Project.title.ilike(search_pattern)) |
-            (Project.description.ilike(search_pattern))
+        # 検索時は関連度順（skip/limit 方式）
+        query, ranking = await search_service.apply_project_search(db, query, search)
+        result = await db.execute(query.order_by(*ranking).offset(skip).limit(limit))
+        return json_response(rows_to_dicts(result, names), response)
+    
+    if cursor:
+        try:
+            query = query.where(
+                keyset_condition((PROJECT_SORT_KEY, Project.id), cursor, descending=True)
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="カーソルが不正です"
+            )
+    else:
+        query = query.offset(skip)
+    
+    query = query.order_by(PROJECT_SORT_KEY.desc(), Project.id.desc())
+    
+    async def load_page():
+        result = await db.execute(query.limit(limit + 1))
+        rows, next_cursor = split_page(
+            result.all(),
+            limit,
+            key=lambda p: (p.updated_at or p.created_at, p.id),
         )
+        return rows_to_dicts(rows, names), next_cursor
     
-    query = query.order_by(Project.updated_at.desc())
+    if cursor is None and skip == 0:
+        # 1ページ目は読み取りが集中するためキャッシュ（書き込みで無効化）
+        projects, next_cursor = await response_cache.get_or_compute(
+            current_user.id,
+            "projects:first_page",
+            {"status": status_filter, "priority": priority, "limit": limit, "fields": names},
+            load_page,
+        )
+    else:
+        projects, next_cursor = await load_page()
     
-    projects = query.offset(skip).limit(limit).all()
-    return projects
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_response(projects, response)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     案件作成
@@ -71,47 +157,66 @@ async def create_project(
     )
     
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    await db.flush()
+    await dashboard_service.record_project_change(
+        db, current_user.id, None, snapshot(new_project, PROJECT_FIELDS)
+    )
+    record_change(db, "project", new_project.id, "create")
+    await db.commit()
+    await db.refresh(new_project)
     
     return new_project
 
 
-@router.get("/stats", response_model=ProjectStats)
+@router.get(
+    "/stats",
+    response_model=ProjectStats,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(check_etag)],
+)
 async def get_project_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    breakdown: List[Literal["priority", "overdue"]] = Query([]),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     案件統計情報取得
     """
-    user_projects = db.query(Project).filter(Project.user_id == current_user.id)
-    
-    stats = {
-        "total": user_projects.count(),
-        "planning": user_projects.filter(Project.status == "planning").count(),
-        "in_progress": user_projects.filter(Project.status == "in_progress").count(),
-        "completed": user_projects.filter(Project.status == "completed").count(),
-        "on_hold": user_projects.filter(Project.status == "on_hold").count(),
-        "cancelled": user_projects.filter(Project.status == "cancelled").count(),
-    }
-    
-    return stats
+    return await response_cache.get_or_compute(
+        current_user.id,
+        "projects:stats",
+        {"breakdown": breakdown},
+        lambda: stats_service.get_project_stats(db, current_user.id, breakdown),
+    )
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
+@router.get(
+    "/{project_id}",
+    response_model=ProjectDetailResponse,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(check_etag)],
+)
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    include: Optional[str] = Query(None, description="同梱する関連データ（tasks,stats）"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     案件詳細取得
+    include=tasks,stats でタスク一覧・タスク統計を同じレスポンスに含める
     """
-    project = db.query(Project).filter(
+    includes = _parse_include(include)
+    
+    query = select(Project).where(
         Project.id == project_id,
         Project.user_id == current_user.id
-    ).first()
+    )
+    if "tasks" in includes:
+        query = query.options(selectinload(Project.tasks))
+    
+    result = await db.execute(query)
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(
@@ -119,23 +224,33 @@ async def get_project(
             detail=f"案件ID {project_id} が見つかりません"
         )
     
-    return project
+    # 未読み込みの関連（tasks）に触れないよう、案件の列だけを先に変換する
+    detail = ProjectResponse.model_validate(project).model_dump()
+    if "tasks" in includes:
+        detail["tasks"] = sorted(project.tasks, key=lambda task: (task.created_at, task.id))
+    if "stats" in includes:
+        detail["stats"] = await stats_service.get_task_stats(db, project.id, current_user.id)
+    
+    return detail
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     案件更新
     """
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(
@@ -143,12 +258,18 @@ async def update_project(
             detail=f"案件ID {project_id} が見つかりません"
         )
     
+    old_values = snapshot(project, PROJECT_FIELDS)
     update_data = project_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    if update_data.keys() & set(PROJECT_FIELDS):
+        await dashboard_service.record_project_change(
+            db, current_user.id, old_values, snapshot(project, PROJECT_FIELDS)
+        )
+    record_change(db, "project", project.id, "update", fields=update_data)
+    await db.commit()
+    await db.refresh(project)
     
     return project
 
@@ -156,16 +277,19 @@ async def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     案件削除
     """
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(
@@ -173,7 +297,18 @@ async def delete_project(
             detail=f"案件ID {project_id} が見つかりません"
         )
     
-    db.delete(project)
-    db.commit()
+    # 連鎖削除されるタスクにも削除の履歴を残す（差分同期のクライアントが削除を受け取れるように）
+    task_ids = (await db.execute(
+        select(Task.id).where(Task.project_id == project_id)
+    )).scalars().all()
+    
+    await db.delete(project)
+    await db.flush()
+    # 配下のタスクも削除されるため、差分ではなくこのユーザーの集計を再計算する
+    await dashboard_service.rebuild_rollups(db, [current_user.id], commit=False)
+    for task_id in task_ids:
+        record_change(db, "task", task_id, "delete", project_id=project_id)
+    record_change(db, "project", project_id, "delete")
+    await db.commit()
     
     return None
@@ -0,0 +1,54 @@
+"""
+差分同期API
+同期トークン以降に作成・更新・削除された案件・タスクを返す（再接続時の全件再取得を置き換える）
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.config import settings
+from app.database import get_db
+from app.schemas.auth import Principal
+from app.schemas.sync import SyncResponse
+from app.core.deps import get_current_principal
+from app.services import sync as sync_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="前回の同期で返された token"),
+    limit: int = Query(settings.SYNC_MAX_CHANGES, ge=1, le=settings.SYNC_MAX_CHANGES),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    差分同期
+    since 未指定時は最新のトークンのみ返す（全件取得の前に取得しておく）
+    since 指定時はそれ以降に作成・更新された行と、削除された行の id を返す
+    案件の削除時は連鎖削除された配下のタスクの id も返す
+    トークンが保持期間切れの場合は 410（全件を取り直して since なしからやり直す）
+    （直前の書き込みを含めるため、レプリカではなくプライマリで読む）
+    """
+    if since is None:
+        return {"token": str(await sync_service.current_token(db, current_user.id))}
+    
+    try:
+        since_seq = int(since)
+    except ValueError:
+        since_seq = -1
+    if since_seq < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="同期トークンが不正です"
+        )
+    
+    if await sync_service.is_token_expired(db, current_user.id, since_seq):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="同期トークンの有効期限が切れています。全件を取得し直してください"
+        )
+    
+    return await sync_service.get_changes(db, current_user.id, since_seq, limit)
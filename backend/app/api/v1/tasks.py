@@ -3,77 +3,137 @@
 CRUD操作
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Literal, Optional
 
 from app.database import get_db
 from app.models.task import Task
 from app.models.project import Project
-from app.models.user import User
+from app.schemas.auth import Principal
 from app.schemas.task import (
     TaskCreate,
     TaskResponse,
     TaskUpdate,
     TaskStats,
+    TaskBatchRequest,
+    TaskBatchResponse,
 )
-from app.core.deps import get_current_user
+from app.core.deps import get_current_principal, get_read_db, get_owned_task
+from app.core.etag import check_etag
+from app.core.events import record_change
+from app.core.response_cache import response_cache
+from app.core.responses import json_response, model_columns, parse_fields, rows_to_dicts
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    keyset_condition,
+    nulls_last_keyset_condition,
+    split_page,
+)
+from app.services import dashboard as dashboard_service
+from app.services import stats as stats_service
+from app.services.dashboard import TASK_FIELDS, snapshot
+from app.services.task_counters import apply_status_change
+from app.services.task_batch import TaskBatch
 
 router = APIRouter()
 
+# ページ分割（次ページのカーソル作成）に必要な項目
+TASK_KEY_FIELDS = ("created_at", "id")
+ASSIGNED_TASK_KEY_FIELDS = ("due_date", "id")
+
 
-@router.get("/project/{project_id}/tasks", response_model=List[TaskResponse])
+@router.get(
+    "/project/{project_id}/tasks",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(check_etag)],
+)
 async def get_project_tasks(
     project_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
     priority: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、例: id,title,status,priority）"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     案件のタスク一覧取得
+    cursor 指定時はキーセット方式、未指定時は skip/limit 方式
+    次ページのカーソルは X-Next-Cursor ヘッダーで返す
+    fields 指定時は指定項目（と id）の列のみ取得して返す
     """
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    names = parse_fields(fields, TaskResponse)
+    select_names = names + [name for name in TASK_KEY_FIELDS if name not in names]
     
-    if not project:
+    result = await db.execute(
+        select(Project.id).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"案件ID {project_id} が見つかりません"
         )
     
-    query = db.query(Task).filter(Task.project_id == project_id)
+    # 応答項目の列のみ取得し、行ごとの Pydantic 検証を省略して orjson で返す
+    query = select(*model_columns(Task, select_names)).where(Task.project_id == project_id)
     
-    if status:
-        query = query.filter(Task.status == status)
+    if status_filter:
+        query = query.where(Task.status == status_filter)
     
     if priority:
-        query = query.filter(Task.priority == priority)
+        query = query.where(Task.priority == priority)
     
-    query = query.order_by(Task.created_at.asc())
+    if cursor:
+        try:
+            query = query.where(keyset_condition((Task.created_at, Task.id), cursor))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="カーソルが不正です"
+            )
+    else:
+        query = query.offset(skip)
     
-    tasks = query.offset(skip).limit(limit).all()
-    return tasks
+    query = query.order_by(Task.created_at.asc(), Task.id.asc())
+    
+    result = await db.execute(query.limit(limit + 1))
+    rows, next_cursor = split_page(
+        result.all(),
+        limit,
+        key=lambda t: (t.created_at, t.id),
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_response(rows_to_dicts(rows, names), response)
 
 
 @router.post("/project/{project_id}/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     project_id: int,
     task_data: TaskCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     タスク作成
     """
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(
@@ -90,144 +150,195 @@ async def create_task(
     new_task = Task(**task_data.model_dump())
     
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.flush()
+    await apply_status_change(db, project_id, None, new_task.status)
+    await dashboard_service.record_task_change(
+        db, current_user.id, None, snapshot(new_task, TASK_FIELDS)
+    )
+    record_change(db, "task", new_task.id, "create", project_id=project_id)
+    await db.commit()
+    await db.refresh(new_task)
     
     return new_task
 
 
-@router.get("/project/{project_id}/tasks/stats", response_model=TaskStats)
-async def get_task_stats(
+@router.post("/project/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def batch_tasks(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    batch_data: TaskBatchRequest,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    タスク統計情報取得
+    タスク一括操作（作成・更新・削除）
+    所有者チェックは1回、操作の種類ごとに1文で実行し、1トランザクションでコミット
+    atomic=True で失敗がある場合は何も適用せず 400 を返す
     """
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Project.id).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
     
-    if not project:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"案件ID {project_id} が見つかりません"
         )
     
-    project_tasks = db.query(Task).filter(Task.project_id == project_id)
+    batch = TaskBatch(project_id, batch_data.operations, user_id=current_user.id)
+    applied = await batch.execute(db, atomic=batch_data.atomic)
     
-    stats = {
-        "total": project_tasks.count(),
-        "todo": project_tasks.filter(Task.status == "todo").count(),
-        "in_progress": project_tasks.filter(Task.status == "in_progress").count(),
-        "completed": project_tasks.filter(Task.status == "completed").count(),
-        "blocked": project_tasks.filter(Task.status == "blocked").count(),
-    }
+    if applied:
+        for entity_id, op, fields in batch.changes():
+            record_change(db, "task", entity_id, op, fields=fields, project_id=project_id)
+        await db.commit()
+    else:
+        await db.rollback()
+        response.status_code = status.HTTP_400_BAD_REQUEST
     
-    return stats
+    return batch.summary(applied)
 
 
-@router.get("/tasks/{task_id}", response_model=TaskResponse)
-async def get_task(
-    task_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+@router.get(
+    "/project/{project_id}/tasks/stats",
+    response_model=TaskStats,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(check_etag)],
+)
+async def get_task_stats(
+    project_id: int,
+    breakdown: List[Literal["priority", "assignee", "overdue"]] = Query([]),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    タスク詳細取得
+    タスク統計情報取得
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    stats = await response_cache.get_or_compute(
+        current_user.id,
+        "tasks:stats",
+        {"project_id": project_id, "breakdown": breakdown},
+        lambda: stats_service.get_task_stats(db, project_id, current_user.id, breakdown),
+    )
     
-    if not task:
+    if stats is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"タスクID {task_id} が見つかりません"
+            detail=f"案件ID {project_id} が見つかりません"
         )
     
-    project = db.query(Project).filter(
-        Project.id == task.project_id,
-        Project.user_id == current_user.id
-    ).first()
+    return stats
+
+
+# /tasks/{task_id} より前に宣言すること（"assigned" がタスクIDとして解釈されないように）
+@router.get("/tasks/assigned", response_model=List[TaskResponse])
+async def get_assigned_tasks(
+    response: Response,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    due_from: Optional[date] = Query(None, description="期日の下限（この日を含む）"),
+    due_to: Optional[date] = Query(None, description="期日の上限（この日を含む）"),
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、例: id,title,status,due_date）"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    自分が担当するタスクの一覧（全案件横断）
+    期日順（期日なしは最後）のキーセット方式、次ページのカーソルは X-Next-Cursor ヘッダーで返す
+    (assigned_to, status, due_date, id) インデックスで担当者のタスクのみを読むため、案件数に依存しない
+    他ユーザーの書き込み（担当の割り当て）でも変わるため ETag は使わない
+    """
+    names = parse_fields(fields, TaskResponse)
+    select_names = names + [name for name in ASSIGNED_TASK_KEY_FIELDS if name not in names]
     
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="このタスクにアクセスする権限がありません"
-        )
+    query = select(*model_columns(Task, select_names)).where(Task.assigned_to == current_user.id)
+    
+    if status_filter:
+        query = query.where(Task.status == status_filter)
     
+    if due_from:
+        query = query.where(Task.due_date >= due_from)
+    
+    if due_to:
+        query = query.where(Task.due_date <= due_to)
+    
+    if cursor:
+        try:
+            query = query.where(nulls_last_keyset_condition(Task.due_date, Task.id, cursor))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="カーソルが不正です"
+            )
+    
+    query = query.order_by(Task.due_date.asc().nulls_last(), Task.id.asc())
+    
+    result = await db.execute(query.limit(limit + 1))
+    rows, next_cursor = split_page(
+        result.all(),
+        limit,
+        key=lambda t: (t.due_date, t.id),
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_response(rows_to_dicts(rows, names), response)
+
+
+@router.get("/tasks/{task_id}", response_model=TaskResponse, dependencies=[Depends(check_etag)])
+async def get_task(task: Task = Depends(get_owned_task)):
+    """
+    タスク詳細取得
+    """
     return task
 
 
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
-    task_id: int,
     task_data: TaskUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    task: Task = Depends(get_owned_task),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     タスク更新
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"タスクID {task_id} が見つかりません"
-        )
-    
-    project = db.query(Project).filter(
-        Project.id == task.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="このタスクを更新する権限がありません"
-        )
-    
+    old_values = snapshot(task, TASK_FIELDS)
     update_data = task_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
     
-    db.commit()
-    db.refresh(task)
+    if "status" in update_data:
+        await apply_status_change(db, task.project_id, old_values["status"], task.status)
+    if update_data.keys() & set(TASK_FIELDS):
+        await dashboard_service.record_task_change(
+            db, current_user.id, old_values, snapshot(task, TASK_FIELDS)
+        )
+    record_change(db, "task", task.id, "update", fields=update_data, project_id=task.project_id)
+    await db.commit()
+    await db.refresh(task)
     
     return task
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
-    task_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    task: Task = Depends(get_owned_task),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     タスク削除
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"タスクID {task_id} が見つかりません"
-        )
-    
-    project = db.query(Project).filter(
-        Project.id == task.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="このタスクを削除する権限がありません"
-        )
-    
-    db.delete(task)
-    db.commit()
+    await apply_status_change(db, task.project_id, task.status, None)
+    await dashboard_service.record_task_change(
+        db, current_user.id, snapshot(task, TASK_FIELDS), None
+    )
+    record_change(db, "task", task.id, "delete", project_id=task.project_id)
+    await db.delete(task)
+    await db.commit()
     
     return None
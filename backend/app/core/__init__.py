@@ -5,13 +5,25 @@
 from app.core.security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    verify_and_update_password,
+    verify_and_update_password_async,
+    get_password_hash_async,
     create_access_token,
     decode_access_token,
+    generate_refresh_token,
+    hash_refresh_token,
 )
 
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "verify_and_update_password",
+    "verify_and_update_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "decode_access_token",
+    "generate_refresh_token",
+    "hash_refresh_token",
 ]
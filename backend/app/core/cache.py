@@ -0,0 +1,267 @@
+"""
+キャッシュバックエンド
+プロセス内LRUキャッシュと共有キャッシュ（Redis互換）の共通インターフェース
+共有キャッシュへの往復でイベントループを止めないよう、操作はすべて非同期
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class CacheBackend:
+    """
+    キャッシュバックエンドの基底クラス
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        キーが未設定の場合のみ設定し、設定できたかを返す（ロック用）
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: str, amount: int = 1, initial: int = 0, ttl: Optional[float] = None) -> int:
+        """
+        カウンタを amount 増やして返す（未設定・期限切れ時は initial から）
+        ttl は新しく作成したときのみ設定し、以降の加算では延長しない
+        """
+        raise NotImplementedError
+
+
+class InMemoryCache(CacheBackend):
+    """
+    プロセス内キャッシュ（LRU + TTL）
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        # ロック取得済みで呼ぶこと
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        ttl = ttl if ttl is not None else self.default_ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                return False
+            self._store(key, value, now + ttl if ttl is not None else None)
+            return True
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    async def incr(self, key: str, amount: int = 1, initial: int = 0, ttl: Optional[float] = None) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                entry = (initial, now + ttl if ttl is not None else None)
+            value = entry[0] + amount
+            self._store(key, value, entry[1])
+            return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalSharedStore:
+    """
+    共有キャッシュサーバーのローカル代替（非同期Redisクライアントの一部APIを実装）
+    開発・テストで SharedCache を外部サーバーなしに動かすために使用
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key: str) -> bool:
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    async def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data[name][0] if self._alive(name) else None
+
+    async def set(self, name: str, value: bytes, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._alive(name):
+                return None
+            expires_at = time.monotonic() + ex if ex is not None else None
+            self._data[name] = (value, expires_at)
+            return True
+
+    async def incrby(self, name: str, amount: int = 1) -> int:
+        with self._lock:
+            value, expires_at = self._data[name] if self._alive(name) else (0, None)
+            value = int(value) + amount
+            self._data[name] = (str(value).encode(), expires_at)
+            return value
+
+    async def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    async def scan_iter(self, match: str):
+        prefix = match.rstrip("*")
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix) and self._alive(k)]
+        for key in keys:
+            yield key
+
+
+class SharedCache(CacheBackend):
+    """
+    共有キャッシュ（Redis互換クライアント）
+    複数ワーカー間でキャッシュと無効化を共有する
+    """
+
+    def __init__(self, client, namespace: str, default_ttl: Optional[float] = None):
+        self.client = client
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self._key(key))
+        return pickle.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        ex = max(1, int(ttl)) if ttl is not None else None
+        await self.client.set(self._key(key), pickle.dumps(value), ex=ex)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        ttl = ttl if ttl is not None else self.default_ttl
+        ex = max(1, int(ttl)) if ttl is not None else None
+        return bool(await self.client.set(self._key(key), pickle.dumps(value), ex=ex, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self._key(key))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self._key(prefix)}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def incr(self, key: str, amount: int = 1, initial: int = 0, ttl: Optional[float] = None) -> int:
+        # カウンタは pickle せず整数文字列で保持（INCRBY を使うため）
+        ex = max(1, int(ttl)) if ttl is not None else None
+        await self.client.set(self._key(key), initial, ex=ex, nx=True)
+        return int(await self.client.incrby(self._key(key), amount))
+
+
+class UserCounter:
+    """
+    ユーザーごとの単調増加カウンタ（データバージョン・イベントIDの共通部分）
+    未設定時（再起動・追い出し後）は現在時刻（マイクロ秒）から始め、過去の値と重複させない
+    複数ワーカー構成では CACHE_BACKEND=shared で共有すること
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str):
+        self.backend = backend
+        self.prefix = prefix
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    @staticmethod
+    def _initial() -> int:
+        return time.time_ns() // 1000
+
+    async def current(self, user_id: int) -> int:
+        return await self.backend.incr(self._key(user_id), amount=0, initial=self._initial())
+
+    async def next(self, user_id: int) -> int:
+        return await self.backend.incr(self._key(user_id), initial=self._initial())
+
+
+_shared_client = None
+
+
+def get_shared_client():
+    """
+    共有キャッシュのクライアントを取得
+    CACHE_URL 未指定時はローカル代替ストアを使用
+    """
+    global _shared_client
+    if _shared_client is None:
+        if settings.CACHE_URL:
+            try:
+                import redis.asyncio as redis
+            except ImportError as exc:
+                raise RuntimeError(
+                    "CACHE_URL を使用するには redis パッケージが必要です"
+                ) from exc
+            _shared_client = redis.Redis.from_url(settings.CACHE_URL)
+        else:
+            _shared_client = LocalSharedStore()
+    return _shared_client
+
+
+def create_cache(
+    namespace: str,
+    maxsize: int = 1024,
+    default_ttl: Optional[float] = None,
+) -> CacheBackend:
+    """
+    設定（CACHE_BACKEND）に応じたキャッシュバックエンドを作成
+    """
+    if settings.CACHE_BACKEND == "shared":
+        return SharedCache(get_shared_client(), namespace, default_ttl=default_ttl)
+    return InMemoryCache(maxsize=maxsize, default_ttl=default_ttl)
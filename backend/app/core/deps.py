@@ -3,33 +3,47 @@
 FastAPIの依存性注入で使用する関数
 """
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 
-from app.database import get_db
+from app.database import get_db, read_session
 from app.config import settings
 from app.models.user import User
-from app.schemas.auth import TokenData
+from app.models.project import Project
+from app.models.task import Task
+from app.schemas.auth import Principal, TokenData
+from app.core.principal_cache import principal_cache
+from app.core.revocation import token_revocations
 
 # OAuth2スキーム（トークン取得）
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# タスク権限エラーのメッセージ（HTTPメソッド別）
+TASK_FORBIDDEN_MESSAGES = {
+    "GET": "このタスクにアクセスする権限がありません",
+    "PUT": "このタスクを更新する権限がありません",
+    "DELETE": "このタスクを削除する権限がありません",
+}
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    現在のユーザーを取得
-    """
-    credentials_exception = HTTPException(
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="認証情報を確認できませんでした",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+async def _decode_token(token: str) -> Tuple[TokenData, dict]:
+    """
+    アクセストークンを検証してクレームを取得（失効リストも確認）
+    """
     try:
         payload = jwt.decode(
             token,
@@ -40,17 +54,98 @@ async def get_current_user(
         email: str = payload.get("email")
         
         if user_id is None or email is None:
-            raise credentials_exception
+            raise _credentials_exception()
         
-        token_data = TokenData(user_id=user_id, email=email)
+        token_data = TokenData(
+            user_id=user_id,
+            email=email,
+            token_version=payload.get("ver", 0),
+            jti=payload.get("jti"),
+        )
+    
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+    
+    if await token_revocations.is_revoked(token_data.user_id, token_data.token_version, token_data.jti):
+        raise _credentials_exception()
     
-    except JWTError:
-        raise credentials_exception
+    return token_data, payload
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    現在のユーザーを取得（高速経路）
+    署名済みクレームと失効リストのみで検証し、DBを参照しない
+    """
+    token_data, _ = await _decode_token(token)
+    
+    # 書き込み後の読み取り振り分け（read-your-writes）のためにユーザーを記録
+    db.info["user_id"] = token_data.user_id
+    
+    return Principal(
+        id=token_data.user_id,
+        email=token_data.email,
+        token_version=token_data.token_version,
+    )
+
+
+async def principal_from_connection(connection: HTTPConnection, access_token: Optional[str] = None) -> Principal:
+    """
+    ストリーミング接続（SSE / WebSocket）のユーザーを取得
+    EventSource・WebSocket はヘッダーを設定できないため、クエリの access_token も受け付ける
+    """
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = access_token
+    if not token:
+        raise _credentials_exception()
+    
+    token_data, _ = await _decode_token(token)
+    return Principal(
+        id=token_data.user_id,
+        email=token_data.email,
+        token_version=token_data.token_version,
+    )
+
+
+async def get_stream_principal(
+    request: Request,
+    access_token: Optional[str] = Query(None),
+) -> Principal:
+    """
+    SSE 接続のユーザーを取得（DBセッションを保持しない）
+    """
+    return await principal_from_connection(request, access_token)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    現在のユーザーを取得（ユーザー情報が必要な場合）
+    """
+    token_data, payload = await _decode_token(token)
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    # 書き込み後の読み取り振り分け（read-your-writes）のためにユーザーを記録
+    db.info["user_id"] = token_data.user_id
     
+    issued_at = payload.get("iat")
+    user = await principal_cache.get(token_data.user_id, issued_at)
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User).where(User.id == token_data.user_id))
+        user = result.scalars().first()
+        
+        if user is None:
+            raise _credentials_exception()
+        
+        await principal_cache.set(user, issued_at, expires_at=payload.get("exp"))
+    
+    if (user.token_version or 0) != token_data.token_version:
+        raise _credentials_exception()
     
     return user
 
@@ -62,3 +157,52 @@ async def get_current_active_user(
     現在のアクティブユーザーを取得
     """
     return current_user
+
+
+async def get_read_db(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    読み取り専用エンドポイント用のセッションを取得
+    レプリカ設定時はレプリカ、直近に書き込んだユーザー・レプリカ障害時はプライマリ
+    """
+    async with read_session(current_user.id, db) as read_db:
+        yield read_db
+
+
+async def get_owned_task(
+    task_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> Task:
+    """
+    所有者チェック済みのタスクを取得
+    タスクと親案件の所有者を1回の JOIN クエリで取得し、
+    タスクがなければ 404、他ユーザーの案件なら 403
+    """
+    result = await db.execute(
+        select(Task, Project.user_id)
+        .join(Task.project)
+        .where(Task.id == task_id)
+    )
+    row = result.first()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"タスクID {task_id} が見つかりません"
+        )
+    
+    task, owner_id = row
+    
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=TASK_FORBIDDEN_MESSAGES.get(
+                request.method, TASK_FORBIDDEN_MESSAGES["GET"]
+            )
+        )
+    
+    return task
@@ -0,0 +1,103 @@
+"""
+条件付きGET（ETag / If-None-Match）
+ユーザーごとのデータバージョン（書き込みコミットごとに加算）から弱いETagを計算し、
+変更がなければクエリ・シリアライズを行わずに 304 を返す
+"""
+
+import hashlib
+from datetime import date
+from typing import Iterable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.core.cache import CacheBackend, UserCounter, create_cache
+from app.core.deps import get_current_principal
+from app.database import on_user_write
+from app.schemas.auth import Principal
+
+
+class DataVersions(UserCounter):
+    """
+    ユーザーごとのデータバージョン（書き込みコミットごとに進める）
+    """
+
+    def __init__(self, backend: CacheBackend):
+        super().__init__(backend, "version")
+
+    async def get(self, user_id: int) -> int:
+        return await self.current(user_id)
+
+    async def bump(self, user_id: int) -> int:
+        return await self.next(user_id)
+
+    async def bump_all(self, user_ids: Iterable[int]) -> None:
+        """
+        バッチ処理で変更したユーザーのバージョンを進める（ETag・レスポンスキャッシュの無効化）
+        バッチは別プロセスで動くため、実行中のワーカーに届くのは CACHE_BACKEND=shared の場合のみ
+        """
+        for user_id in set(user_ids):
+            await self.bump(user_id)
+
+
+class ETagStats:
+    """
+    条件付きGETのヒット率
+    """
+
+    def __init__(self):
+        self.checks = 0
+        self.not_modified = 0
+
+    def stats(self) -> dict:
+        return {
+            "checks": self.checks,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.not_modified / self.checks, 4) if self.checks else 0.0,
+        }
+
+
+data_versions = DataVersions(create_cache("data_version", maxsize=100000))
+etag_stats = ETagStats()
+
+# 案件・タスクの書き込みがコミットされたらバージョンを進める
+on_user_write(data_versions.bump)
+
+
+def compute_etag(request: Request, user_id: int, version: int) -> str:
+    """
+    (ユーザー, バージョン, URL, 日付) から弱いETagを計算
+    日付は期限切れ件数など日付で変わる集計のために含める
+    """
+    params = sorted(request.query_params.multi_items())
+    source = f"{user_id}:{version}:{request.url.path}:{params}:{date.today().isoformat()}"
+    return f'W/"{hashlib.sha1(source.encode()).hexdigest()}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # 弱い比較（W/ の有無を無視）
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+async def check_etag(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+) -> str:
+    """
+    If-None-Match が現在のETagと一致すれば 304、そうでなければレスポンスにETagを設定
+    ルートの dependencies に指定し、本体のクエリより前に評価させる
+    """
+    etag = compute_etag(request, current_user.id, await data_versions.get(current_user.id))
+    etag_stats.checks += 1
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        etag_stats.not_modified += 1
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag},
+        )
+
+    response.headers["ETag"] = etag
+    return etag
@@ -0,0 +1,312 @@
+"""
+変更通知（SSE / WebSocket の変更イベント配信）
+案件・タスクの書き込みをコミット後にユーザーごとのイベントとして配信し、
+フロントエンドのポーリングを置き換える
+
+- ChangeBroker: プロセス内の配信（接続ごとの上限付きキュー・再送用バッファ）
+- LocalEventBus / SharedEventBus: ワーカー間の中継（shared は共有キャッシュサーバーの Pub/Sub）
+- 同じイベントをコミット時に change_log にも書き込み、差分同期（GET /sync）に使う
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+import orjson
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import CacheBackend, UserCounter, create_cache, get_shared_client
+from app.database import after_commit
+from app.models.change_log import ChangeLog
+from app.models.user import User
+
+# 接続を閉じて再同期を求める合図（キューあふれ・再送範囲外）
+RESET = {"type": "reset"}
+
+CHANNEL = "change_events"
+
+
+class Subscription:
+    """
+    1接続分の購読（上限付きキュー）
+    """
+
+    __slots__ = ("user_id", "queue", "closed")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # RESET を積んだ後は以降のイベントを積まない（接続は RESET の送信後に閉じる）
+        self.closed = False
+
+    def push(self, item: Dict) -> bool:
+        """
+        イベントを追加（キューが満杯なら破棄して RESET のみ残し、False を返す）
+        """
+        if self.closed:
+            return True
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET)
+            self.closed = True
+            return False
+        self.closed = item is RESET
+        return True
+
+    async def get(self, timeout: float) -> Optional[Dict]:
+        """
+        次のイベント（timeout 秒以内になければ None、ハートビート送信用）
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeBroker:
+    """
+    プロセス内のイベント配信
+    ユーザーごとに直近のイベントを保持し、Last-Event-ID からの再送に使う
+    """
+
+    def __init__(self, queue_size: int, replay_size: int, replay_users: int):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.replay_users = replay_users
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._replay: "OrderedDict[int, Deque[Dict]]" = OrderedDict()
+        self.published = 0
+        self.overflowed = 0
+
+    def subscribe(
+        self,
+        user_id: int,
+        last_event_id: Optional[int] = None,
+        latest_event_id: Optional[int] = None,
+    ) -> Subscription:
+        """
+        購読を開始し、last_event_id より後のイベントを先に積む
+        再送範囲外（バッファから消えている）の場合は RESET を積む
+        latest_event_id: 発行済みの最新ID（バッファにないイベントの有無の判定に使う）
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        if last_event_id is not None:
+            for item in self._replay_after(user_id, last_event_id, latest_event_id):
+                if not subscription.push(item):
+                    break
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def _replay_after(
+        self,
+        user_id: int,
+        last_event_id: int,
+        latest_event_id: Optional[int],
+    ) -> List[Dict]:
+        missed = [item for item in self._replay.get(user_id, ()) if item["id"] > last_event_id]
+        if missed and missed[0]["id"] > last_event_id + 1:
+            # 保持範囲より古いイベントを取りこぼしているため再同期を求める
+            return [RESET]
+        if not missed and latest_event_id is not None and latest_event_id > last_event_id:
+            # このワーカーに保持されていない（再起動後など）
+            return [RESET]
+        return missed
+
+    def deliver(self, user_id: int, item: Dict) -> None:
+        """
+        イベントをユーザーの全接続に配信（ワーカー間中継からも呼ばれる）
+        """
+        buffer = self._replay.get(user_id)
+        if buffer is None:
+            buffer = self._replay[user_id] = deque(maxlen=self.replay_size)
+            while len(self._replay) > self.replay_users:
+                self._replay.popitem(last=False)
+        else:
+            self._replay.move_to_end(user_id)
+        buffer.append(item)
+
+        self.published += 1
+        for subscription in self._subscribers.get(user_id, ()):
+            if not subscription.push(item):
+                self.overflowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "connections": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "overflowed": self.overflowed,
+        }
+
+
+class LocalEventBus:
+    """
+    ワーカー間中継のローカル代替（同じプロセスの ChangeBroker に直接配信）
+    """
+
+    def __init__(self, broker: ChangeBroker):
+        self.broker = broker
+
+    async def publish(self, user_id: int, item: Dict) -> None:
+        self.broker.deliver(user_id, item)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class SharedEventBus(LocalEventBus):
+    """
+    共有キャッシュサーバー（Redis）の Pub/Sub によるワーカー間中継
+    各ワーカーは全イベントを受信し、自分の接続と再送用バッファに配信する
+    """
+
+    def __init__(self, broker: ChangeBroker, url: str):
+        super().__init__(broker)
+        self.url = url
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, user_id: int, item: Dict) -> None:
+        await get_shared_client().publish(CHANNEL, orjson.dumps({"user_id": user_id, "event": item}))
+
+    async def _listen(self) -> None:
+        import redis.asyncio as redis
+
+        client = redis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                payload = orjson.loads(message["data"])
+                self.broker.deliver(payload["user_id"], payload["event"])
+        finally:
+            await pubsub.close()
+            await client.close()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def create_event_bus(broker: ChangeBroker) -> LocalEventBus:
+    """
+    設定（EVENT_BUS）に応じたワーカー間中継を作成
+    shared でも CACHE_URL 未指定時はローカル代替を使用
+    """
+    if settings.EVENT_BUS == "shared" and settings.CACHE_URL:
+        try:
+            import redis  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError(
+                "EVENT_BUS=shared を使用するには redis パッケージが必要です"
+            ) from exc
+        return SharedEventBus(broker, settings.CACHE_URL)
+    return LocalEventBus(broker)
+
+
+class EventIds(UserCounter):
+    """
+    ユーザーごとのイベントID（配信ごとに進める）
+    """
+
+    def __init__(self, backend: CacheBackend):
+        super().__init__(backend, "event_id")
+
+    async def latest(self, user_id: int) -> int:
+        return await self.current(user_id)
+
+
+change_broker = ChangeBroker(
+    queue_size=settings.EVENT_QUEUE_SIZE,
+    replay_size=settings.EVENT_REPLAY_SIZE,
+    replay_users=settings.EVENT_REPLAY_USERS,
+)
+change_bus = create_event_bus(change_broker)
+event_ids = EventIds(create_cache("event_id", maxsize=settings.EVENT_REPLAY_USERS))
+
+
+def record_change(
+    db,
+    entity: str,
+    entity_id: int,
+    op: str,
+    fields: Optional[Iterable[str]] = None,
+    **extra: Any,
+) -> None:
+    """
+    変更イベントをセッションに記録
+    コミット時に change_log へ書き込み、コミット後に配信する（ロールバック時は破棄）
+    op: create / update / delete、fields: 更新した項目
+    """
+    change = {"entity": entity, "entity_id": entity_id, "op": op}
+    if fields is not None:
+        change["fields"] = sorted(fields)
+    change.update(extra)
+    db.info.setdefault("change_events", []).append(change)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_change_log(session):
+    # 書き込みと同じトランザクションで変更履歴を追記（複数件は1回の INSERT）
+    changes = session.info.get("change_events")
+    user_id = session.info.get("user_id")
+    if not changes or user_id is None:
+        return
+    # seq は INSERT 時に採番されるため、同じユーザーの書き込みを直列化して seq の順とコミット順を揃える
+    # （揃わないと、先に大きい seq を受け取ったクライアントが後からコミットされた小さい seq を取りこぼす）
+    # 他の行のロック待ちで詰まらないよう、保留中の書き込みを反映してから最後にロックを取る
+    # FOR NO KEY UPDATE なので、このユーザーを参照する行の INSERT（外部キーの確認）は妨げない
+    session.flush()
+    session.execute(
+        select(User.id).where(User.id == user_id).with_for_update(key_share=True)
+    )
+    session.execute(
+        insert(ChangeLog),
+        [
+            {
+                "user_id": user_id,
+                "entity": change["entity"],
+                "entity_id": change["entity_id"],
+                "op": change["op"],
+            }
+            for change in changes
+        ],
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    changes = session.info.pop("change_events", None)
+    user_id = session.info.get("user_id")
+    if not changes or user_id is None:
+        return
+
+    async def publish():
+        for change in changes:
+            await change_bus.publish(user_id, {"id": await event_ids.next(user_id), **change})
+
+    after_commit(session, publish)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("change_events", None)
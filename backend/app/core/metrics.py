@@ -0,0 +1,188 @@
+"""
+メトリクス
+Prometheus テキスト形式で出力するカウンタ・ゲージ・ヒストグラム
+"""
+
+import bisect
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# 秒単位の既定バケット（Prometheus クライアントと同じ）
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    メトリクスの基底クラス（ラベル値ごとに値を保持）
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._label_values(labels)] = value
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # ラベル値 → (バケットごとの件数, 合計, 件数)
+        self._values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            entry[0][index] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class MetricsRegistry:
+    """
+    メトリクスの登録と Prometheus テキスト形式での出力
+    既存の統計（キャッシュのヒット数など）は collector で出力時に取得する
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def stats_counters(
+    prefix: str,
+    documentation: str,
+    stats: Dict[str, float],
+    gauges: Iterable[str] = (),
+) -> List[Metric]:
+    """
+    stats() の辞書（hits, misses, hit_rate など）をメトリクスに変換
+    比率と gauges に指定した項目（接続数など増減する値）はゲージ、それ以外はカウンタとして出力
+    """
+    metrics: List[Metric] = []
+    for key, value in stats.items():
+        if key.endswith("_rate") or key in gauges:
+            metric = Gauge(f"{prefix}_{key}", f"{documentation} ({key})")
+            metric.set(value)
+        else:
+            metric = Counter(f"{prefix}_{key}_total", f"{documentation} ({key})")
+            metric.inc(value)
+        metrics.append(metric)
+    return metrics
+
+
+registry = MetricsRegistry()
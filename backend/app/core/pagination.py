@@ -0,0 +1,120 @@
+"""
+キーセット（カーソル）ページネーション
+(ソートキー, id) の組で次ページの開始位置を表す
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import literal, or_, tuple_
+
+# 次ページのカーソルを返すレスポンスヘッダー
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    ソートキーの値をURLセーフな不透明文字列に変換
+    """
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    カーソル文字列をソートキーの値に戻す
+    不正な値の場合は ValueError
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("invalid cursor")
+    return [_decode_value(v) for v in values]
+
+
+def _check_value(value: Any, column) -> Any:
+    """
+    カーソルの値がソート列の型と一致するか確認（不一致は ValueError）
+    改ざんされたカーソルの値をバインド時の型エラー（500）にせず、不正なカーソルとして扱う
+    """
+    expected = column.type.python_type
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ValueError("invalid cursor")
+    # datetime は date のサブクラスのため、日付列には日時を受け付けない
+    if expected is date and isinstance(value, datetime):
+        raise ValueError("invalid cursor")
+    return value
+
+
+def keyset_condition(sort_columns: Sequence, cursor: str, descending: bool = False):
+    """
+    カーソル位置より後ろの行を絞り込む行値比較条件
+    (sort_key, id) > (:sort_key, :id)（降順の場合は <）
+    """
+    values = decode_cursor(cursor)
+    if len(values) != len(sort_columns):
+        raise ValueError("invalid cursor")
+    key = tuple_(*sort_columns)
+    bound = tuple_(*[literal(_check_value(v, col), col.type) for v, col in zip(values, sort_columns)])
+    return key < bound if descending else key > bound
+
+
+def nulls_last_keyset_condition(sort_column, id_column, cursor: str):
+    """
+    NULL を最後に並べる昇順 (sort_key NULLS LAST, id) のカーソル位置より後ろの行を絞り込む条件
+    NULL 以外の位置からは (sort_key, id) > (:sort_key, :id) または sort_key IS NULL、
+    NULL の位置からは sort_key IS NULL かつ id > :id
+    """
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise ValueError("invalid cursor")
+    sort_value, id_value = values
+    _check_value(id_value, id_column)
+    if sort_value is not None:
+        _check_value(sort_value, sort_column)
+    if sort_value is None:
+        return sort_column.is_(None) & (id_column > id_value)
+    bound = tuple_(literal(sort_value, sort_column.type), literal(id_value, id_column.type))
+    return or_(tuple_(sort_column, id_column) > bound, sort_column.is_(None))
+
+
+def split_page(
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], Tuple],
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    limit + 1 件取得した結果をページ本体と次ページカーソルに分割
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
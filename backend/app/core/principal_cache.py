@@ -0,0 +1,99 @@
+"""
+認証済みユーザー（プリンシパル）キャッシュ
+get_current_user のユーザー取得クエリを省略する
+"""
+
+import time
+from functools import partial
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.core.cache import CacheBackend, create_cache
+from app.database import after_commit
+from app.models.user import User
+
+# キャッシュに載せない列（共有キャッシュにハッシュを置かない）
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class PrincipalCache:
+    """
+    (user_id, トークンの iat) をキーにユーザー情報をキャッシュ
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id: int, issued_at) -> str:
+        return f"principal:{user_id}:{issued_at or 0}"
+
+    async def get(self, user_id: int, issued_at) -> Optional[User]:
+        data = await self.backend.get(self._key(user_id, issued_at))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return User(**data)
+
+    async def set(self, user: User, issued_at, expires_at: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            # トークンの有効期限を超えて保持しない
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        data = {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+            if attr.key not in EXCLUDED_COLUMNS
+        }
+        await self.backend.set(self._key(user.id, issued_at), data, ttl=ttl)
+
+    async def invalidate(self, user_id: int) -> None:
+        await self.backend.delete_prefix(f"principal:{user_id}:")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    create_cache(
+        "principal",
+        maxsize=settings.PRINCIPAL_CACHE_SIZE,
+        default_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ),
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# ユーザー更新・削除時の無効化
+# flush時点で対象を記録し、コミット後に無効化する（コミット前の古い値の再キャッシュを防ぐ）
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        after_commit(session, partial(principal_cache.invalidate, user_id))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,176 @@
+"""
+クエリ計測（スロークエリ・N+1 の検出）
+リクエストごとのクエリ数を数え、閾値を超えたクエリと、同じ形のクエリの繰り返し（N+1 の疑い）を
+ルートとともに構造化ログと /debug/queries のレポートに記録する
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("app.queries")
+
+_WHITESPACE = re.compile(r"\s+")
+# IN (?, ?, ?) のような展開されたパラメータと番号付きパラメータ（$1 など）を1つにまとめる
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\)")
+_NUMBERED_PARAM = re.compile(r"\$\d+")
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+def statement_shape(statement: str) -> str:
+    """
+    パラメータ値を除いたクエリの形（同じ形なら同じ文字列）
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    shape = _NUMBERED_PARAM.sub("?", shape)
+    return shape[:MAX_STATEMENT_LENGTH]
+
+
+class QueryProfiler:
+    """
+    クエリ計測の集計
+    sample_rate の割合のリクエストについて全クエリを記録し、スロークエリは全リクエストで記録する
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        slow_threshold_ms: int,
+        n_plus_one_threshold: int,
+        report_size: int,
+    ):
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_queries: deque = deque(maxlen=report_size)
+        self.n_plus_one: deque = deque(maxlen=report_size)
+        # ルート → 集計（計測したリクエスト数・クエリ数の合計と最大・N+1 検出数）
+        self.routes: Dict[str, Dict[str, int]] = {}
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def is_slow(self, duration: float) -> bool:
+        return 0 < self.slow_threshold <= duration
+
+    def finish(
+        self,
+        method: str,
+        route: str,
+        queries: Optional[List[Tuple[str, float]]],
+        slow: Optional[List[Tuple[str, float]]],
+    ) -> None:
+        """
+        リクエスト終了時に記録（queries は計測対象のリクエストのみ）
+        """
+        endpoint = f"{method} {route}"
+        now = time.time()
+
+        for statement, duration in slow or ():
+            entry = {
+                "event": "slow_query",
+                "route": endpoint,
+                "duration_ms": round(duration * 1000, 2),
+                "statement": statement_shape(statement),
+                "at": now,
+            }
+            self.slow_queries.append(entry)
+            logger.warning(json.dumps(entry, ensure_ascii=False))
+
+        if queries is None:
+            return
+
+        summary = self.routes.setdefault(
+            endpoint, {"requests": 0, "queries": 0, "max_queries": 0, "n_plus_one": 0}
+        )
+        summary["requests"] += 1
+        summary["queries"] += len(queries)
+        summary["max_queries"] = max(summary["max_queries"], len(queries))
+
+        shapes = Counter(statement_shape(statement) for statement, _ in queries)
+        for shape, count in shapes.items():
+            if count < self.n_plus_one_threshold:
+                continue
+            entry = {
+                "event": "n_plus_one",
+                "route": endpoint,
+                "count": count,
+                "total_queries": len(queries),
+                "statement": shape,
+                "at": now,
+            }
+            summary["n_plus_one"] += 1
+            self.n_plus_one.append(entry)
+            logger.warning(json.dumps(entry, ensure_ascii=False))
+
+    def report(self) -> dict:
+        routes = {
+            endpoint: {
+                **summary,
+                "avg_queries": round(summary["queries"] / summary["requests"], 2),
+            }
+            for endpoint, summary in sorted(
+                self.routes.items(), key=lambda item: item[1]["max_queries"], reverse=True
+            )
+        }
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_query_threshold_ms": self.slow_threshold * 1000,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "routes": routes,
+            "slow_queries": list(reversed(self.slow_queries)),
+            "n_plus_one": list(reversed(self.n_plus_one)),
+        }
+
+
+class QueryCounter:
+    """
+    with ブロック内で実行されたクエリを数える（テスト用）
+    TestClient はアプリを別スレッドで実行するため、コンテキスト変数ではなくエンジンのイベントで数える
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    def describe(self) -> str:
+        shapes = Counter(statement_shape(statement) for statement in self.statements)
+        return "\n".join(f"{count}x {shape}" for shape, count in shapes.most_common())
+
+
+def _default_sample_rate() -> float:
+    if settings.QUERY_PROFILE_SAMPLE_RATE is not None:
+        return settings.QUERY_PROFILE_SAMPLE_RATE
+    return 1.0 if settings.DEBUG else 0.0
+
+
+query_profiler = QueryProfiler(
+    sample_rate=_default_sample_rate(),
+    slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    report_size=settings.QUERY_REPORT_SIZE,
+)
@@ -0,0 +1,114 @@
+"""
+レート制限
+ログイン試行を IP・メールアドレスごとに制限し、DB参照・パスワード照合の前に拒否する
+"""
+
+import math
+import time
+from typing import Optional
+
+from app.config import settings
+from app.core.cache import CacheBackend, create_cache
+
+
+class SlidingWindowLimiter:
+    """
+    スライディングウィンドウ（直前ウィンドウの件数を経過率で按分）によるレート制限
+    カウンタはキャッシュバックエンドに保持（shared で複数ワーカー間共有）
+    """
+
+    def __init__(self, backend: CacheBackend, name: str, limit: int, window_seconds: int):
+        self.backend = backend
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    async def hit(self, key: str, now: Optional[float] = None) -> float:
+        """
+        試行を1件記録し、制限超過なら再試行までの秒数、許可なら 0 を返す
+        """
+        now = time.time() if now is None else now
+        window = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+        ttl = self.window_seconds * 2
+
+        current = await self.backend.incr(f"{self.name}:{key}:{window}", ttl=ttl)
+        previous = await self.backend.incr(f"{self.name}:{key}:{window - 1}", amount=0, ttl=ttl)
+        if previous * (1 - elapsed) + current <= self.limit:
+            return 0.0
+        return self.window_seconds * (1 - elapsed)
+
+    async def reset(self, key: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        window = int(now // self.window_seconds)
+        await self.backend.delete(f"{self.name}:{key}:{window}")
+        await self.backend.delete(f"{self.name}:{key}:{window - 1}")
+
+
+class LoginRateLimiter:
+    """
+    ログイン試行の制限（IP単位・メールアドレス単位）
+    """
+
+    def __init__(self, by_ip: SlidingWindowLimiter, by_email: SlidingWindowLimiter):
+        self.by_ip = by_ip
+        self.by_email = by_email
+        self.allowed = 0
+        self.throttled_ip = 0
+        self.throttled_email = 0
+
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    async def check(self, ip: str, email: str) -> int:
+        """
+        試行を記録し、拒否する場合は Retry-After の秒数、許可なら 0 を返す
+        IP 単位で拒否した試行はメールアドレス単位には数えない
+        """
+        retry_after = await self.by_ip.hit(ip)
+        if retry_after:
+            self.throttled_ip += 1
+            return math.ceil(retry_after)
+
+        retry_after = await self.by_email.hit(self._normalize_email(email))
+        if retry_after:
+            self.throttled_email += 1
+            return math.ceil(retry_after)
+
+        self.allowed += 1
+        return 0
+
+    async def reset_email(self, email: str) -> None:
+        """
+        ログイン成功時にメールアドレス単位のカウンタを戻す
+        """
+        await self.by_email.reset(self._normalize_email(email))
+
+    def stats(self) -> dict:
+        throttled = self.throttled_ip + self.throttled_email
+        total = self.allowed + throttled
+        return {
+            "allowed": self.allowed,
+            "throttled_ip": self.throttled_ip,
+            "throttled_email": self.throttled_email,
+            "throttle_rate": round(throttled / total, 4) if total else 0.0,
+        }
+
+
+_backend = create_cache("rate_limit", maxsize=settings.LOGIN_RATE_LIMIT_CACHE_SIZE)
+
+login_rate_limiter = LoginRateLimiter(
+    by_ip=SlidingWindowLimiter(
+        _backend,
+        "login_ip",
+        limit=settings.LOGIN_RATE_LIMIT_PER_IP,
+        window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    ),
+    by_email=SlidingWindowLimiter(
+        _backend,
+        "login_email",
+        limit=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+        window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    ),
+)
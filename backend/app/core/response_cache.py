@@ -0,0 +1,123 @@
+"""
+サーバーサイドのレスポンスキャッシュ
+統計・一覧1ページ目など、読み取りが多く更新が少ない結果を保持する
+キーにユーザーのデータバージョンを含めるため、書き込みコミットでバージョンが進むと
+古いキーは参照されなくなる（削除はせず TTL・LRU で追い出す）
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+from app.core.cache import CacheBackend, create_cache
+from app.core.etag import data_versions
+
+# 再計算中ロックの待機間隔（秒）
+LOCK_POLL_INTERVAL = 0.05
+
+
+class ResponseCache:
+    """
+    (user_id, バージョン, エンドポイント, 正規化したパラメータ) をキーにした結果キャッシュ
+    期限切れ・未作成のキーは1リクエストだけが再計算する（スタンピード防止）
+    - 同一プロセス内: キーごとの asyncio.Lock
+    - ワーカー間: バックエンドの add によるロック（共有バックエンド時）
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, lock_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    async def _key(user_id: int, endpoint: str, params: Dict[str, Any]) -> str:
+        version = await data_versions.get(user_id)
+        normalized = json.dumps(
+            {k: sorted(v) if isinstance(v, list) else v for k, v in params.items() if v is not None},
+            sort_keys=True,
+            default=str,
+        )
+        return f"{user_id}:{version}:{endpoint}:{normalized}"
+
+    async def get_or_compute(
+        self,
+        user_id: int,
+        endpoint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        キャッシュ済みの結果を返し、なければ compute() の結果を保存して返す
+        compute() が None を返した場合（404 など）は保存しない
+        """
+        key = await self._key(user_id, endpoint, params)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                value = await self.backend.get(key)
+                if value is not None:
+                    self.coalesced += 1
+                    return value
+
+                value = await self._wait_for_other_worker(key)
+                if value is not None:
+                    self.coalesced += 1
+                    return value
+
+                self.misses += 1
+                try:
+                    value = await compute()
+                    if value is not None:
+                        await self.backend.set(key, value, ttl=self.ttl_seconds)
+                finally:
+                    await self.backend.delete(f"lock:{key}")
+                return value
+        finally:
+            if not lock.locked() and self._locks.get(key) is lock:
+                del self._locks[key]
+
+    async def _wait_for_other_worker(self, key: str) -> Optional[Any]:
+        """
+        ロックを取得できるまで他ワーカーの計算結果を待つ
+        ロックを取得した（自分が計算する）場合は None を返す
+        """
+        deadline = time.monotonic() + self.lock_seconds
+        while not await self.backend.add(f"lock:{key}", 1, ttl=self.lock_seconds):
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            value = await self.backend.get(key)
+            if value is not None:
+                return value
+        return None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    create_cache(
+        "response",
+        maxsize=settings.RESPONSE_CACHE_SIZE,
+        default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    ),
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    lock_seconds=settings.RESPONSE_CACHE_LOCK_SECONDS,
+)
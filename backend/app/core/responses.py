@@ -0,0 +1,91 @@
+"""
+高速JSONレスポンス
+orjson でエンコードし、一覧系は Pydantic の行ごとの検証を通さずに返す
+"""
+
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # Pydantic の JSON 出力に合わせて Decimal は文字列にする
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    orjson によるJSONエンコード（レスポンス・エクスポートで共通の形式）
+    """
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+    )
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson によるJSONレスポンス（アプリ全体の既定クラス）
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(
+    fields: Optional[str],
+    schema: Type[BaseModel],
+    optional: Sequence[str] = (),
+) -> List[str]:
+    """
+    fields パラメータ（カンマ区切り）をスキーマの項目で検証
+    未指定時は optional 以外の全項目、指定時も id は常に含める
+    """
+    if not fields:
+        return [name for name in schema.model_fields if name not in optional]
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields に指定できない項目です: {', '.join(unknown)}"
+        )
+    if "id" not in names:
+        names.insert(0, "id")
+    return list(dict.fromkeys(names))
+
+
+def model_columns(model, names: Sequence[str]) -> List:
+    """
+    項目名に対応するモデルの列（列のみの SELECT 用）
+    """
+    return [getattr(model, name) for name in names]
+
+
+def rows_to_dicts(rows: Iterable, names: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    行を dict に変換（names 指定時はその項目のみ）
+    """
+    if names is None:
+        return [dict(row._mapping) for row in rows]
+    return [{name: getattr(row, name) for name in names} for row in rows]
+
+
+def json_response(content: Any, response: Response) -> FastJSONResponse:
+    """
+    content をそのままエンコードして返す（response_model の検証を省略）
+    依存関係・ハンドラーで設定したヘッダー（ETag, X-Next-Cursor 等）を引き継ぐ
+    """
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key not in ("content-length", "content-type")
+    }
+    return FastJSONResponse(content, headers=headers)
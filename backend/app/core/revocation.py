@@ -0,0 +1,49 @@
+"""
+アクセストークンの失効リスト
+ステートレス検証（DB参照なし）で使う小さな失効セット
+保持期間はアクセストークンの有効期限までで、それ以降は署名の期限切れで拒否される
+"""
+
+import time
+from typing import Optional
+
+from app.config import settings
+from app.core.cache import CacheBackend, create_cache
+
+ACCESS_TOKEN_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+class TokenRevocations:
+    """
+    失効済みのトークン（jti）と、ユーザーごとの有効なトークン世代の下限
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def revoke_token(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """
+        アクセストークン1件を失効（ログアウト）
+        """
+        ttl = ACCESS_TOKEN_TTL_SECONDS
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl > 0:
+            await self.backend.set(f"jti:{jti}", True, ttl=ttl)
+
+    async def revoke_user(self, user_id: int, token_version: int) -> None:
+        """
+        token_version 未満の世代のアクセストークンをすべて失効（全端末ログアウト）
+        """
+        await self.backend.set(f"user:{user_id}", token_version, ttl=ACCESS_TOKEN_TTL_SECONDS)
+
+    async def is_revoked(self, user_id: int, token_version: int, jti: Optional[str]) -> bool:
+        min_version = await self.backend.get(f"user:{user_id}")
+        if min_version is not None and token_version < min_version:
+            return True
+        return jti is not None and await self.backend.get(f"jti:{jti}") is not None
+
+
+token_revocations = TokenRevocations(
+    create_cache("revocation", maxsize=100000, default_ttl=ACCESS_TOKEN_TTL_SECONDS)
+)
@@ -3,14 +3,69 @@
 JWT認証、パスワードハッシュ化
 """
 
+import asyncio
+import hashlib
+import secrets
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from app.config import settings
 
+
+def build_password_context() -> CryptContext:
+    """
+    設定からパスワードハッシュのコンテキストを作成
+    既定方式・コストと異なる既存ハッシュは needs_update で再ハッシュ対象になる
+    """
+    schemes = [settings.PASSWORD_HASH_SCHEME]
+    if "bcrypt" not in schemes:
+        schemes.append("bcrypt")  # 移行前の bcrypt ハッシュも検証できるようにする
+    return CryptContext(
+        schemes=schemes,
+        default=settings.PASSWORD_HASH_SCHEME,
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__time_cost=settings.ARGON2_TIME_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+
+
 # パスワードハッシュ化
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context()
+
+# ハッシュ計算用のプロセスプール（上限付き）
+# リクエストを処理するワーカーのCPUを使わず、コア数に応じて並列に処理する
+_hash_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+
+async def start_hash_executor() -> None:
+    """
+    ハッシュ計算用プロセスプールを起動（アプリ起動時）
+    リクエスト処理中ではなく起動直後にワーカープロセスを作成しておく
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_get_hash_executor(), int)
+
+
+def shutdown_hash_executor() -> None:
+    """
+    ハッシュ計算用プロセスプールを停止（アプリ終了時）
+    """
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +75,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    パスワード検証と再ハッシュ
+    ハッシュの方式・コストが現在の設定と異なる場合は新しいハッシュを返す
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     パスワードハッシュ化
@@ -27,20 +93,53 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    パスワード検証（ワーカープロセスで実行）
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_hash_executor(), verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    パスワード検証と再ハッシュ（ワーカープロセスで実行）
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_hash_executor(), verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    パスワードハッシュ化（ワーカープロセスで実行）
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     JWTアクセストークン作成
     """
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
+        expire = issued_at + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode.update({"exp": expire})
+    # jti: トークン単位の失効（ログアウト）に使用
+    to_encode.update({"exp": expire, "iat": issued_at, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -50,6 +149,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def generate_refresh_token() -> str:
+    """
+    リフレッシュトークン（ランダムな不透明文字列）を生成
+    """
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    リフレッシュトークンの保存用ハッシュ（SHA-256）
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """
     JWTトークンデコード
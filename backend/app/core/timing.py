@@ -0,0 +1,158 @@
+"""
+リクエスト計測ミドルウェア
+ルート別のレイテンシ・処理中リクエスト数・レスポンスサイズ・DB時間を記録する
+クエリ計測（スロークエリ・N+1 の検出）へのクエリの受け渡しも行う
+"""
+
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import SIZE_BUCKETS, registry
+from app.core.query_profiler import query_profiler
+
+# ルートに一致しなかったリクエスト（404 など）はまとめて集計し、ラベルの種類を増やさない
+UNMATCHED_ROUTE = "unmatched"
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "リクエスト数",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "リクエストの処理時間（秒）",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "処理中のリクエスト数",
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "レスポンスボディのサイズ（バイト）",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+db_request_duration = registry.histogram(
+    "http_request_db_duration_seconds",
+    "リクエスト中のDB処理時間（秒）",
+    ("method", "route"),
+)
+db_request_queries = registry.histogram(
+    "http_request_db_queries",
+    "リクエスト中のクエリ数",
+    ("method", "route"),
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+
+
+class RequestStats:
+    """
+    1リクエスト分のDB計測値
+    queries は計測対象のリクエストのみ全クエリを、slow はスロークエリを (SQL, 秒) で保持
+    """
+
+    __slots__ = ("db_time", "db_queries", "queries", "slow")
+
+    def __init__(self, profile: bool = False):
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.queries: Optional[List[Tuple[str, float]]] = [] if profile else None
+        self.slow: Optional[List[Tuple[str, float]]] = None
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+# 全エンジン（プライマリ・レプリカ）の同期エンジンに対してクエリ時間を記録
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    starts = conn.info.get("query_start_time")
+    if stats is None or not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    stats.db_time += duration
+    stats.db_queries += 1
+    if stats.queries is not None:
+        stats.queries.append((statement, duration))
+    if query_profiler.is_slow(duration):
+        if stats.slow is None:
+            stats.slow = []
+        stats.slow.append((statement, duration))
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # エラー時は after_cursor_execute が呼ばれないため開始時刻を捨てる
+    starts = context.connection.info.get("query_start_time") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _route_template(scope: Scope) -> str:
+    # ルーティング後に FastAPI が scope に設定するルートのパステンプレート（/api/v1/projects/{project_id} など）
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class TimingMiddleware:
+    """
+    リクエスト計測（純粋な ASGI ミドルウェア）
+    BaseHTTPMiddleware と異なりボディを中継しないため、ストリーミングレスポンスにも影響しない
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(profile=query_profiler.should_sample())
+        token = _request_stats.set(stats)
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            _request_stats.reset(token)
+
+            method = scope["method"]
+            route = _route_template(scope)
+            http_requests.inc(method=method, route=route, status=str(status_code))
+            http_request_duration.observe(duration, method=method, route=route)
+            http_response_size.observe(body_size, method=method, route=route)
+            db_request_duration.observe(stats.db_time, method=method, route=route)
+            db_request_queries.observe(stats.db_queries, method=method, route=route)
+            if stats.queries is not None or stats.slow:
+                query_profiler.finish(method, route, stats.queries, stats.slow)
@@ -1,38 +1,240 @@
 """
 データベース接続設定
-SQLAlchemy設定
+SQLAlchemy設定（非同期）
+プライマリ（読み書き）と読み取り専用レプリカの振り分け
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import logging
+import time
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from app.config import settings
+from app.core.cache import CacheBackend, create_cache
+
+logger = logging.getLogger("app.database")
+
+# 同期ドライバ名 → 非同期ドライバ名
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-# データベースエンジン
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # SQLログ出力（開発時のみ）
+
+def to_async_url(url: str) -> str:
+    """
+    DATABASE_URL を非同期ドライバのURLに変換
+    （postgresql:// → postgresql+asyncpg:// など）
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> Dict:
+    """
+    接続プール・タイムアウト設定（Settings から）
+    SQLite はドライバ既定のプール（NullPool/StaticPool）を使うため対象外
+    """
+    options: Dict = {"echo": settings.DB_ECHO}
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)},
+        }
+    return options
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    async_url = to_async_url(url)
+    return create_async_engine(async_url, **engine_options(async_url))
+
+
+# データベースエンジン（プライマリ）
+engine = create_engine_for(settings.DATABASE_URL)
+
+# 読み取り専用レプリカ（未設定時は None）
+replica_engine: Optional[AsyncEngine] = (
+    create_engine_for(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
 )
 
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+class AppSession(AsyncSession):
+    """
+    コミット後の非同期処理（共有キャッシュの更新・変更通知の配信）を commit() の中で待つセッション
+    after_commit イベントは同期関数のため、処理を after_commit() で積んでおき、ここで await する
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        # DB のコミットは完了しているため、失敗した処理はログに残して残りの処理を続ける（例外にしない）
+        for callback in self.info.pop(AFTER_COMMIT_KEY, []):
+            try:
+                await callback()
+            except Exception:
+                logger.exception("コミット後の処理に失敗しました: %r", callback)
+
+
+def after_commit(session: Session, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    コミット完了後に await する処理を登録（after_commit イベントから呼ぶ）
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
 # セッションローカル
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
+SessionLocal = async_sessionmaker(
     bind=engine,
+    class_=AppSession,
+    autoflush=False,
+    expire_on_commit=False,  # コミット後の属性アクセスで暗黙のI/Oを発生させない
+)
+
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        bind=replica_engine,
+        class_=AppSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
 )
 
 # モデルのベースクラス
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """
+    作成・更新日時の既定値（アプリ側で設定）
+    DB の now() は SQLite では秒単位の文字列で保存され、カーソルの日時（マイクロ秒付き）と
+    文字列比較で食い違うため、保存形式をバインド値と揃える
+    """
+    return datetime.now(timezone.utc)
+
+
 # データベースセッション取得（依存性注入）
-def get_db():
+async def get_db():
     """
     データベースセッションを取得
     FastAPIの依存性注入で使用
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+class ReplicaRouter:
+    """
+    読み取りクエリの振り分け状態
+    - 直近に書き込んだユーザーはレプリカ遅延を避けてプライマリを読む
+      （書き込みの記録はキャッシュバックエンドに保持し、shared なら別ワーカーの書き込みも反映する）
+    - レプリカに接続できなければ一定時間プライマリへ切り替える（プロセス内）
+    """
+
+    def __init__(self, backend: CacheBackend, read_after_write_seconds: float, retry_after_seconds: float):
+        self.backend = backend
+        self.read_after_write_seconds = read_after_write_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._replica_down_until = 0.0
+
+    async def record_write(self, user_id: int) -> None:
+        if ReplicaSessionLocal is None:
+            return
+        # TTL を書き込み直後の期間にして、期限切れのエントリはバックエンドに追い出させる
+        await self.backend.set(f"last_write:{user_id}", True, ttl=self.read_after_write_seconds)
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        return await self.backend.get(f"last_write:{user_id}") is not None
+
+    def replica_available(self) -> bool:
+        return ReplicaSessionLocal is not None and time.monotonic() >= self._replica_down_until
+
+    def mark_replica_down(self) -> None:
+        self._replica_down_until = time.monotonic() + self.retry_after_seconds
+
+
+replica_router = ReplicaRouter(
+    create_cache("replica", maxsize=100000),
+    read_after_write_seconds=settings.REPLICA_READ_AFTER_WRITE_SECONDS,
+    retry_after_seconds=settings.REPLICA_RETRY_AFTER_SECONDS,
+)
+
+
+@asynccontextmanager
+async def read_session(user_id: int, primary: AsyncSession):
+    """
+    読み取り用セッションを取得
+    レプリカを使えない・使うべきでない場合はリクエストのプライマリセッションを返す
+    """
+    if not replica_router.replica_available() or await replica_router.wrote_recently(user_id):
+        yield primary
+        return
+
+    async with ReplicaSessionLocal() as db:
+        try:
+            await db.connection()
+        except (SQLAlchemyError, OSError):
+            replica_router.mark_replica_down()
+            yield primary
+            return
+        yield db
+
+
+# 書き込みの検知（セッションに user_id が設定されている場合のみ記録）
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+# 書き込みコミット時に呼ぶ処理（引数: user_id、コミット完了後に await する）
+_write_listeners: List[Callable[[int], Awaitable[None]]] = [replica_router.record_write]
+
+
+def on_user_write(listener: Callable[[int], Awaitable[None]]) -> Callable[[int], Awaitable[None]]:
+    """
+    ユーザーの書き込みがコミットされたときに呼ぶ処理を登録
+    """
+    _write_listeners.append(listener)
+    return listener
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session):
+    if session.info.pop("has_writes", False) and "user_id" in session.info:
+        for listener in _write_listeners:
+            after_commit(session, partial(listener, session.info["user_id"]))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session):
+    session.info.pop("has_writes", None)
@@ -5,6 +5,20 @@ FastAPI Application Entry Point
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.core.etag import etag_stats
+from app.core.events import change_broker, change_bus
+from app.core.metrics import registry, stats_counters
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.responses import FastJSONResponse
+from app.core.security import start_hash_executor, shutdown_hash_executor
+from app.core.principal_cache import principal_cache
+from app.core.query_profiler import query_profiler
+from app.core.rate_limit import login_rate_limiter
+from app.core.response_cache import response_cache
+from app.core.timing import TimingMiddleware
 
 # アプリケーション作成
 app = FastAPI(
@@ -13,6 +27,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
 )
 
 # CORS設定（フロントエンドからのアクセスを許可）
@@ -26,8 +41,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# リクエスト計測（CORS より外側で全リクエストを計測）
+app.add_middleware(TimingMiddleware)
+
 
 # ルートエンドポイント
 @app.get("/")
@@ -52,9 +71,60 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected",
+        "principal_cache": principal_cache.stats(),
+        "etag": etag_stats.stats(),
+        "response_cache": response_cache.stats(),
+        "login_rate_limit": login_rate_limiter.stats(),
+        "change_events": change_broker.stats(),
     }
 
 
+# 既存の統計を /metrics にも出力
+registry.register_collector(lambda: [
+    *stats_counters("principal_cache", "認証ユーザーキャッシュ", principal_cache.stats()),
+    *stats_counters("etag", "条件付きGET", etag_stats.stats()),
+    *stats_counters("response_cache", "レスポンスキャッシュ", response_cache.stats()),
+    *stats_counters("login_rate_limit", "ログイン試行の制限", login_rate_limiter.stats()),
+    *stats_counters("change_events", "変更通知", change_broker.stats(), gauges=("connections",)),
+])
+
+
+# メトリクスエンドポイント
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus テキスト形式のメトリクス
+    """
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# クエリ計測レポート（SQL の形とルート別の統計を含むため DEBUG 時のみ公開）
+if settings.DEBUG:
+    @app.get("/debug/queries", include_in_schema=False)
+    async def debug_queries():
+        """
+        ルート別のクエリ数・スロークエリ・N+1 の疑いがあるクエリ
+        """
+        return query_profiler.report()
+
+
+def check_worker_settings() -> None:
+    """
+    複数ワーカー構成の設定を確認
+    プロセス内キャッシュではデータバージョン・書き込み直後の読み取り振り分けがワーカーごとになり、
+    別ワーカーで変更済みのデータに 304 を返したり、レプリカの古い結果に新しい ETag を付けたりするため起動しない
+    ワーカー数は WEB_CONCURRENCY で判定する。uvicorn / gunicorn に --workers N を直接指定した場合は
+    アプリから検出できないため、WEB_CONCURRENCY も同じ値にすること
+    """
+    if settings.WEB_CONCURRENCY > 1 and settings.CACHE_BACKEND != "shared":
+        raise RuntimeError(
+            "複数ワーカー（WEB_CONCURRENCY > 1）で起動する場合は CACHE_BACKEND=shared を設定してください"
+        )
+
+
 # スタートアップイベント
 @app.on_event("startup")
 async def startup_event():
@@ -63,6 +133,9 @@ async def startup_event():
     """
     print("🚀 Project Management API starting...")
     print("📚 API Docs: http://localhost:8000/docs")
+    check_worker_settings()
+    await start_hash_executor()
+    await change_bus.start()
 
 
 # シャットダウンイベント
@@ -72,11 +145,17 @@ async def shutdown_event():
     アプリケーション終了時の処理
     """
     print("👋 Project Management API shutting down...")
+    shutdown_hash_executor()
+    await change_bus.stop()
 
 
 # APIルーター登録
-from app.api.v1 import auth, projects, tasks
+from app.api.v1 import auth, projects, tasks, export, dashboard, events, sync
 
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(projects.router, prefix="/api/v1/projects", tags=["projects"])
 app.include_router(tasks.router, prefix="/api/v1", tags=["tasks"])
+app.include_router(export.router, prefix="/api/v1/export", tags=["export"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
+app.include_router(events.router, prefix="/api/v1/events", tags=["events"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["sync"])
@@ -5,5 +5,8 @@
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task
+from app.models.refresh_token import RefreshToken
+from app.models.dashboard_rollup import DashboardRollup
+from app.models.change_log import ChangeLog
 
-__all__ = ["User", "Project", "Task"]
+__all__ = ["User", "Project", "Task", "RefreshToken", "DashboardRollup", "ChangeLog"]
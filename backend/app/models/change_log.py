@@ -0,0 +1,41 @@
+"""
+変更履歴モデル
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base, utcnow
+
+
+class ChangeLog(Base):
+    """
+    変更履歴テーブル（差分同期 GET /sync 用）
+    案件・タスクの書き込みと同じトランザクションで1件ずつ追記する
+    削除も記録するため、物理削除された行の削除（トゥームストーン）を返せる
+    seq が同期トークン（単調増加）
+    """
+    
+    __tablename__ = "change_log"
+    __table_args__ = (
+        # ユーザーごとのトークン以降の変更（変更件数に比例した読み取り）
+        Index("ix_change_log_user_seq", "user_id", "seq"),
+        # 保持期間を過ぎた履歴の削除
+        Index("ix_change_log_changed_at", "changed_at"),
+    )
+    
+    # 主キー（同期トークン）
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    
+    # 外部キー
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    
+    # 変更内容（entity: project / task、op: create / update / delete）
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    
+    # タイムスタンプ
+    changed_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, entity={self.entity}, entity_id={self.entity_id}, op={self.op})>"
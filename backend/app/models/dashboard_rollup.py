@@ -0,0 +1,53 @@
+"""
+ダッシュボード集計モデル
+"""
+
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, DECIMAL
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class DashboardRollup(Base):
+    """
+    ユーザーごとのダッシュボード集計テーブル
+    案件・タスクの書き込みと同じトランザクションで差分を加算し、毎晩の再集計でずれを修復する
+    期限切れ件数は overdue_as_of 時点の判定（再集計時に当日へ進める）
+    """
+    
+    __tablename__ = "dashboard_rollups"
+    
+    # 主キー（ユーザー）
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 案件のステータス別件数
+    projects_total = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_planning = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_on_hold = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_cancelled = Column(Integer, nullable=False, default=0, server_default="0")
+    projects_overdue = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # タスクのステータス別件数
+    tasks_total = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_todo = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_blocked = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_overdue = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # 予算・工数の合計
+    budget_total = Column(DECIMAL(14, 2), nullable=False, default=0, server_default="0")
+    estimated_hours_total = Column(DECIMAL(12, 2), nullable=False, default=0, server_default="0")
+    actual_hours_total = Column(DECIMAL(12, 2), nullable=False, default=0, server_default="0")
+    
+    # 期限切れ判定の基準日・最終再集計日時
+    overdue_as_of = Column(Date, nullable=False, server_default=func.current_date())
+    rebuilt_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # リレーション
+    user = relationship("User")
+    
+    def __repr__(self):
+        return f"<DashboardRollup(user_id={self.user_id}, projects_total={self.projects_total})>"
@@ -2,10 +2,11 @@
 案件（プロジェクト）モデル
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, DECIMAL, ARRAY
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, DECIMAL, ARRAY, JSON, Index, Float, case, cast
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from app.database import Base
+from sqlalchemy.orm import column_property, deferred, relationship
+from app.database import Base, utcnow
 
 
 class Project(Base):
@@ -14,6 +15,10 @@ class Project(Base):
     """
     
     __tablename__ = "projects"
+    __table_args__ = (
+        # 一覧の絞り込み（ユーザー × ステータス × 優先度）
+        Index("ix_projects_user_status_priority", "user_id", "status", "priority"),
+    )
     
     # 主キー
     id = Column(Integer, primary_key=True, index=True)
@@ -48,12 +53,51 @@ class Project(Base):
     repository_url = Column(String(500))
     demo_url = Column(String(500))
     
-    # 技術スタック（配列）
-    tech_stack = Column(ARRAY(Text))
+    # 技術スタック（配列、SQLiteでは JSON 配列）
+    tech_stack = Column(ARRAY(Text).with_variant(JSON(), "sqlite"))
+    
+    # 全文検索用（PostgreSQLではトリガーで自動更新、SQLiteでは未使用）
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+    
+    # タスク件数（非正規化カウンタ、タスクの書き込みと同じトランザクションで更新）
+    task_total = Column(Integer, nullable=False, default=0, server_default="0")
+    task_todo = Column(Integer, nullable=False, default=0, server_default="0")
+    task_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    task_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    task_blocked = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # 進捗率（%、完了タスク / 全タスク、同じ行の列から計算）
+    progress = column_property(
+        case(
+            (task_total > 0, cast(task_completed * 100.0 / task_total, Float)),
+            else_=0.0,
+        )
+    )
     
     # タイムスタンプ
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # リレーション（タスクの削除はDBの ON DELETE CASCADE に任せる）
+    owner = relationship("User", back_populates="projects")
+    tasks = relationship(
+        "Task",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     
     def __repr__(self):
         return f"<Project(id={self.id}, title={self.title}, status={self.status})>"
+
+
+# 一覧の並び順 COALESCE(updated_at, created_at) DESC, id DESC に対応する式インデックス
+Index(
+    "ix_projects_user_sort_key",
+    Project.user_id,
+    func.coalesce(Project.updated_at, Project.created_at).desc(),
+    Project.id.desc(),
+)
+
+# 全文検索（GIN）
+Index("ix_projects_search_vector", Project.search_vector, postgresql_using="gin")
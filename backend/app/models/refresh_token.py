@@ -0,0 +1,40 @@
+"""
+リフレッシュトークンモデル
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base, utcnow
+
+
+class RefreshToken(Base):
+    """
+    リフレッシュトークンテーブル
+    トークン本体は保存せず SHA-256 ハッシュのみ保持する
+    ローテーションで発行されたトークンは同じ family_id を持ち、
+    使用済みトークンの再利用を検知したらファミリー全体を失効させる
+    """
+    
+    __tablename__ = "refresh_tokens"
+    
+    # 主キー
+    id = Column(Integer, primary_key=True)
+    
+    # 外部キー
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # トークン情報
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True))
+    
+    # タイムスタンプ
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    
+    # リレーション
+    user = relationship("User", back_populates="refresh_tokens")
+    
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id={self.family_id})>"
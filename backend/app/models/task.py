@@ -2,10 +2,10 @@
 タスクモデル
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, DECIMAL, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Task(Base):
@@ -14,6 +14,30 @@ class Task(Base):
     """
     
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 案件内の一覧（作成日時順）・外部キー検索
+        Index("ix_tasks_project_created", "project_id", "created_at", "id"),
+        # 案件内のステータス絞り込み
+        Index("ix_tasks_project_status_created", "project_id", "status", "created_at", "id"),
+        # 担当タスク一覧（担当者 × ステータス × 期日順）・外部キー検索
+        Index(
+            "ix_tasks_assigned_status_due",
+            "assigned_to",
+            "status",
+            "due_date",
+            "id",
+            postgresql_where=text("assigned_to IS NOT NULL"),
+            sqlite_where=text("assigned_to IS NOT NULL"),
+        ),
+        # 未完了タスクの期日（期限切れ集計）
+        Index(
+            "ix_tasks_project_open_due",
+            "project_id",
+            "due_date",
+            postgresql_where=text("status <> 'completed'"),
+            sqlite_where=text("status <> 'completed'"),
+        ),
+    )
     
     # 主キー
     id = Column(Integer, primary_key=True, index=True)
@@ -45,8 +69,12 @@ class Task(Base):
     actual_hours = Column(DECIMAL(5, 2))
     
     # タイムスタンプ
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # リレーション
+    project = relationship("Project", back_populates="tasks")
+    assignee = relationship("User", back_populates="assigned_tasks")
     
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
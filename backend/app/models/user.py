@@ -4,7 +4,8 @@
 
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.sql import func
-from app.database import Base
+from sqlalchemy.orm import relationship
+from app.database import Base, utcnow
 
 
 class User(Base):
@@ -22,9 +23,17 @@ class User(Base):
     username = Column(String(100), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     
+    # トークン世代（加算すると発行済みのアクセストークンがすべて無効になる）
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # タイムスタンプ
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # リレーション（削除時に関連行をORMで読み込まない）
+    projects = relationship("Project", back_populates="owner", passive_deletes=True)
+    assigned_tasks = relationship("Task", back_populates="assignee", passive_deletes=True)
+    refresh_tokens = relationship("RefreshToken", back_populates="user", passive_deletes=True)
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
@@ -0,0 +1,58 @@
+"""
+pytest プラグイン（エンドポイントごとのクエリ数の上限を検査）
+conftest.py に pytest_plugins = ["app.pytest_plugin"] を指定して使う
+
+    def test_get_projects(client, headers, assert_max_queries):
+        with assert_max_queries(2):
+            client.get("/api/v1/projects/", headers=headers)
+
+    @pytest.mark.max_queries(5)
+    def test_create_task(client, headers):
+        ...
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.query_profiler import QueryCounter
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "max_queries(n): テスト全体で実行するクエリ数の上限")
+
+
+def _check(counter: QueryCounter, limit: int) -> None:
+    if counter.count > limit:
+        pytest.fail(
+            f"クエリ数が上限を超えました: {counter.count} > {limit}\n{counter.describe()}",
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    with ブロック内のクエリ数が上限以下であることを検査するコンテキストマネージャ
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with QueryCounter() as counter:
+            yield counter
+        _check(counter, limit)
+
+    return _assert_max_queries
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("max_queries")
+    if marker is None:
+        yield
+        return
+
+    with QueryCounter() as counter:
+        outcome = yield
+    if outcome.excinfo is None:
+        _check(counter, marker.args[0])
@@ -3,13 +3,25 @@
 """
 
 from app.schemas.user import UserBase, UserCreate, UserResponse, UserInDB
-from app.schemas.auth import Token, TokenData, LoginRequest
-from app.schemas.project import ProjectBase, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats
-from app.schemas.task import TaskBase, TaskCreate, TaskUpdate, TaskResponse, TaskStats
+from app.schemas.auth import Token, TokenData, LoginRequest, RefreshRequest, Principal
+from app.schemas.project import (
+    ProjectBase, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats,
+    ProjectDetailResponse,
+)
+from app.schemas.task import (
+    TaskBase, TaskCreate, TaskUpdate, TaskResponse, TaskStats, AssigneeCount,
+    TaskBatchOperation, TaskBatchRequest, TaskBatchItemResult, TaskBatchResponse,
+)
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.sync import SyncDeleted, SyncResponse
 
 __all__ = [
     "UserBase", "UserCreate", "UserResponse", "UserInDB",
-    "Token", "TokenData", "LoginRequest",
+    "Token", "TokenData", "LoginRequest", "RefreshRequest", "Principal",
     "ProjectBase", "ProjectCreate", "ProjectUpdate", "ProjectResponse", "ProjectStats",
-    "TaskBase", "TaskCreate", "TaskUpdate", "TaskResponse", "TaskStats",
+    "ProjectDetailResponse",
+    "TaskBase", "TaskCreate", "TaskUpdate", "TaskResponse", "TaskStats", "AssigneeCount",
+    "TaskBatchOperation", "TaskBatchRequest", "TaskBatchItemResult", "TaskBatchResponse",
+    "DashboardResponse",
+    "SyncDeleted", "SyncResponse",
 ]
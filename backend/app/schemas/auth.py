@@ -12,6 +12,7 @@ class Token(BaseModel):
     """
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
 
 
 class TokenData(BaseModel):
@@ -20,6 +21,8 @@ class TokenData(BaseModel):
     """
     user_id: Optional[int] = None
     email: Optional[str] = None
+    token_version: int = 0
+    jti: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
@@ -28,3 +31,19 @@ class LoginRequest(BaseModel):
     """
     email: EmailStr
     password: str
+
+
+class RefreshRequest(BaseModel):
+    """
+    トークン更新・ログアウトリクエスト
+    """
+    refresh_token: str
+
+
+class Principal(BaseModel):
+    """
+    認証済みユーザー（アクセストークンの署名済みクレームのみから作成、DB参照なし）
+    """
+    id: int
+    email: str
+    token_version: int = 0
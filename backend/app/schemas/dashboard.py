@@ -0,0 +1,25 @@
+"""
+ダッシュボードスキーマ
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.schemas.project import ProjectStats
+from app.schemas.task import TaskStats
+
+
+class DashboardResponse(BaseModel):
+    """
+    ダッシュボードレスポンススキーマ
+    期限切れ件数は overdue_as_of 時点の判定
+    """
+    projects: ProjectStats
+    tasks: TaskStats
+    budget_total: Decimal
+    estimated_hours_total: Decimal
+    actual_hours_total: Decimal
+    overdue_as_of: date
+    rebuilt_at: Optional[datetime] = None
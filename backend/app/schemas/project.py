@@ -3,10 +3,12 @@
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date, datetime
 from decimal import Decimal
 
+from app.schemas.task import TaskResponse, TaskStats
+
 
 class ProjectBase(BaseModel):
     """
@@ -58,6 +60,14 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
+    # タスク件数・進捗率（%）（一覧では include_counts=true または fields 指定時のみ）
+    task_total: Optional[int] = None
+    task_todo: Optional[int] = None
+    task_in_progress: Optional[int] = None
+    task_completed: Optional[int] = None
+    task_blocked: Optional[int] = None
+    progress: Optional[float] = None
+    
     class Config:
         from_attributes = True
 
@@ -72,3 +82,13 @@ class ProjectStats(BaseModel):
     completed: int
     on_hold: int
     cancelled: int
+    overdue: Optional[int] = None
+    by_priority: Optional[Dict[str, int]] = None
+
+
+class ProjectDetailResponse(ProjectResponse):
+    """
+    案件詳細レスポンススキーマ（include 指定時のみタスク・統計を含む）
+    """
+    tasks: Optional[List[TaskResponse]] = None
+    stats: Optional[TaskStats] = None
@@ -0,0 +1,30 @@
+"""
+差分同期スキーマ
+"""
+
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.project import ProjectResponse
+from app.schemas.task import TaskResponse
+
+
+class SyncDeleted(BaseModel):
+    """
+    削除された行の id（トゥームストーン）
+    """
+    projects: List[int] = []
+    tasks: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """
+    差分同期レスポンススキーマ
+    token: 次回の since に渡す同期トークン
+    has_more: 続きがある場合は token を since にして再度取得する
+    """
+    token: str
+    has_more: bool = False
+    projects: List[ProjectResponse] = []
+    tasks: List[TaskResponse] = []
+    deleted: SyncDeleted = SyncDeleted()
@@ -3,10 +3,13 @@
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Optional, List, Dict, Literal
 from datetime import date, datetime
 from decimal import Decimal
 
+# バッチ操作の最大件数
+MAX_BATCH_OPERATIONS = 5000
+
 
 class TaskBase(BaseModel):
     """
@@ -57,6 +60,14 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+class AssigneeCount(BaseModel):
+    """
+    担当者別タスク件数
+    """
+    assigned_to: Optional[int] = None
+    count: int
+
+
 class TaskStats(BaseModel):
     """
     タスク統計スキーマ
@@ -66,3 +77,49 @@ class TaskStats(BaseModel):
     in_progress: int
     completed: int
     blocked: int
+    overdue: Optional[int] = None
+    by_priority: Optional[Dict[str, int]] = None
+    by_assignee: Optional[List[AssigneeCount]] = None
+
+
+class TaskBatchOperation(BaseModel):
+    """
+    タスクバッチ操作（1件）
+    create: data に TaskCreate 相当（project_id は省略可）
+    update: id と data に TaskUpdate 相当
+    delete: id のみ
+    """
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class TaskBatchRequest(BaseModel):
+    """
+    タスクバッチリクエスト
+    atomic=True（既定）: 1件でも失敗したら全件を適用しない
+    atomic=False: 成功した操作のみ適用する
+    """
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    atomic: bool = True
+
+
+class TaskBatchItemResult(BaseModel):
+    """
+    タスクバッチ操作の結果（1件）
+    """
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    """
+    タスクバッチレスポンス
+    """
+    applied: bool
+    succeeded: int
+    failed: int
+    results: List[TaskBatchItemResult]
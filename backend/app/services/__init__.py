@@ -0,0 +1,4 @@
+"""
+サービスパッケージ
+複数のAPIで共有するDB処理
+"""
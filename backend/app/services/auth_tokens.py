@@ -0,0 +1,148 @@
+"""
+トークン発行サービス
+アクセストークンとリフレッシュトークン（ローテーション・失効管理）の発行
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import utcnow
+from app.core.security import create_access_token, generate_refresh_token, hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite ではタイムゾーンなしで返るため UTC とみなす
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def issue_access_token(user: User) -> str:
+    return create_access_token(
+        data={
+            "sub": str(user.id),  # sub は文字列（JWT仕様）
+            "email": user.email,
+            "ver": user.token_version or 0,
+        },
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+def add_refresh_token(db: AsyncSession, user: User, family_id: Optional[str] = None) -> str:
+    """
+    リフレッシュトークンを作成してセッションに追加（コミットは呼び出し側）
+    """
+    token = generate_refresh_token()
+    db.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+async def issue_tokens(db: AsyncSession, user: User) -> Dict:
+    """
+    ログイン時のトークン発行（新しいファミリー）
+    """
+    refresh_token = add_refresh_token(db, user)
+    await db.commit()
+    return {
+        "access_token": issue_access_token(user),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+async def _revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[Dict]:
+    """
+    リフレッシュトークンを使用済みにして新しいトークンを発行
+    無効・期限切れ・使用済みの場合は None（使用済みトークンの再利用はファミリー全体を失効）
+    """
+    result = await db.execute(
+        select(RefreshToken, User)
+        .join(RefreshToken.user)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    stored, user = row
+    if _as_utc(stored.expires_at) <= utcnow():
+        return None
+
+    # 同時に使われた場合も1回だけ成功させる（条件付き UPDATE）
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == stored.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        # 使用済みトークンの再利用（漏えいの可能性）
+        await _revoke_family(db, stored.family_id)
+        await db.commit()
+        return None
+
+    refresh_token = add_refresh_token(db, user, family_id=stored.family_id)
+    await db.commit()
+    return {
+        "access_token": issue_access_token(user),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str, user_id: int) -> None:
+    """
+    リフレッシュトークンのファミリーを失効（ログアウト）
+    """
+    result = await db.execute(
+        select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.user_id == user_id,
+        )
+    )
+    family_id = result.scalar()
+    if family_id is not None:
+        await _revoke_family(db, family_id)
+        await db.commit()
+
+
+async def revoke_all_tokens(db: AsyncSession, user_id: int) -> int:
+    """
+    ユーザーのトークン世代を進め、リフレッシュトークンをすべて失効（全端末ログアウト）
+    新しいトークン世代を返す
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    token_version = result.scalar_one()
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return token_version
@@ -0,0 +1,264 @@
+"""
+ダッシュボード集計サービス
+案件・タスクの書き込みごとに dashboard_rollups へ差分を加算し、
+毎晩の全件再集計でずれ（と期限切れ判定の基準日）を修復する
+
+毎晩の再集計: python -m app.services.dashboard
+"""
+
+import asyncio
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import data_versions
+from app.database import SessionLocal, engine
+from app.models.dashboard_rollup import DashboardRollup
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.services.stats import (
+    PROJECT_CLOSED_STATUSES,
+    PROJECT_STATUSES,
+    TASK_CLOSED_STATUSES,
+    TASK_STATUSES,
+    project_overdue_condition,
+    task_overdue_condition,
+)
+
+PROJECT_FIELDS = ("status", "budget", "end_date")
+TASK_FIELDS = ("status", "estimated_hours", "actual_hours", "due_date")
+
+
+def snapshot(obj: Any, fields: Iterable[str]) -> Dict:
+    """
+    集計に関わる項目の値（ORM オブジェクト・行のどちらからも取得できる）
+    """
+    return {field: getattr(obj, field) for field in fields}
+
+
+class RollupDelta:
+    """
+    1ユーザー分の集計の増減
+    期限切れ件数は基準日（overdue_as_of）と比較するため、期日ごとの増減として保持する
+    """
+
+    def __init__(self):
+        self.values: Counter = Counter()
+        self.overdue: Dict[str, Counter] = {
+            "projects_overdue": Counter(),
+            "tasks_overdue": Counter(),
+        }
+
+    def project(self, values: Optional[Dict], sign: int = 1) -> None:
+        if values is None:
+            return
+        status = values["status"]
+        self.values["projects_total"] += sign
+        if status in PROJECT_STATUSES:
+            self.values[f"projects_{status}"] += sign
+        self.values["budget_total"] += sign * (values["budget"] or 0)
+        if values["end_date"] and status not in PROJECT_CLOSED_STATUSES:
+            self.overdue["projects_overdue"][values["end_date"]] += sign
+
+    def task(self, values: Optional[Dict], sign: int = 1) -> None:
+        if values is None:
+            return
+        status = values["status"]
+        self.values["tasks_total"] += sign
+        if status in TASK_STATUSES:
+            self.values[f"tasks_{status}"] += sign
+        self.values["estimated_hours_total"] += sign * (values["estimated_hours"] or 0)
+        self.values["actual_hours_total"] += sign * (values["actual_hours"] or 0)
+        if values["due_date"] and status not in TASK_CLOSED_STATUSES:
+            self.overdue["tasks_overdue"][values["due_date"]] += sign
+
+    def project_changed(self, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """
+        案件の作成（old=None）・更新・削除（new=None）を反映
+        """
+        self.project(old, -1)
+        self.project(new)
+
+    def task_changed(self, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """
+        タスクの作成（old=None）・更新・削除（new=None）を反映
+        """
+        self.task(old, -1)
+        self.task(new)
+
+    def assignments(self) -> Dict:
+        """
+        UPDATE の SET 句（列 = 列 + 増減、変化のない列は含めない）
+        """
+        values = {
+            column: getattr(DashboardRollup, column) + amount
+            for column, amount in self.values.items()
+            if amount
+        }
+        for column, by_date in self.overdue.items():
+            terms = [
+                case((DashboardRollup.overdue_as_of > due, amount), else_=0)
+                for due, amount in by_date.items()
+                if amount
+            ]
+            if terms:
+                values[column] = getattr(DashboardRollup, column) + sum(terms[1:], terms[0])
+        return values
+
+
+async def apply_rollup_delta(db: AsyncSession, user_id: int, delta: RollupDelta) -> None:
+    """
+    集計に差分を加算（主キー1行の UPDATE、コミットは呼び出し側）
+    """
+    values = delta.assignments()
+    if not values:
+        return
+    await db.execute(
+        update(DashboardRollup)
+        .where(DashboardRollup.user_id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def record_project_change(
+    db: AsyncSession,
+    user_id: int,
+    old: Optional[Dict],
+    new: Optional[Dict],
+) -> None:
+    """
+    案件1件の変更を集計に反映（値は snapshot(project, PROJECT_FIELDS)）
+    """
+    delta = RollupDelta()
+    delta.project_changed(old, new)
+    await apply_rollup_delta(db, user_id, delta)
+
+
+async def record_task_change(
+    db: AsyncSession,
+    user_id: int,
+    old: Optional[Dict],
+    new: Optional[Dict],
+) -> None:
+    """
+    タスク1件の変更を集計に反映（値は snapshot(task, TASK_FIELDS)）
+    """
+    delta = RollupDelta()
+    delta.task_changed(old, new)
+    await apply_rollup_delta(db, user_id, delta)
+
+
+def _rollup_expressions(today: date) -> Dict:
+    """
+    ユーザーごとの集計値を案件・タスクから求める相関サブクエリ
+    """
+    owner = Project.user_id == DashboardRollup.user_id
+
+    def projects(column, *conditions):
+        return select(column).where(owner, *conditions).scalar_subquery()
+
+    def tasks(column, *conditions):
+        return (
+            select(column)
+            .select_from(Task)
+            .join(Task.project)
+            .where(owner, *conditions)
+            .scalar_subquery()
+        )
+
+    values = {
+        "projects_total": projects(func.count(Project.id)),
+        "projects_overdue": projects(func.count(Project.id), project_overdue_condition(today)),
+        "budget_total": func.coalesce(projects(func.sum(Project.budget)), 0),
+        "tasks_total": tasks(func.count(Task.id)),
+        "tasks_overdue": tasks(func.count(Task.id), task_overdue_condition(today)),
+        "estimated_hours_total": func.coalesce(tasks(func.sum(Task.estimated_hours)), 0),
+        "actual_hours_total": func.coalesce(tasks(func.sum(Task.actual_hours)), 0),
+    }
+    for status in PROJECT_STATUSES:
+        values[f"projects_{status}"] = projects(func.count(Project.id), Project.status == status)
+    for status in TASK_STATUSES:
+        values[f"tasks_{status}"] = tasks(func.count(Task.id), Task.status == status)
+    return values
+
+
+async def rebuild_rollups(
+    db: AsyncSession,
+    user_ids: Optional[Iterable[int]] = None,
+    commit: bool = True,
+) -> int:
+    """
+    案件・タスクから全項目を再集計（集計行のないユーザーは作成）
+    期限切れ判定の基準日を当日に進める。再集計したユーザー数を返す
+    commit=True の場合は再集計したユーザーのデータバージョンも進める
+    （基準日の更新は書き込みコミットではないため、ETag・レスポンスキャッシュが古い件数のまま残る）
+    """
+    today = date.today()
+    user_ids = list(user_ids) if user_ids is not None else None
+
+    missing = select(User.id).where(
+        User.id.notin_(select(DashboardRollup.user_id))
+    )
+    if user_ids is not None:
+        missing = missing.where(User.id.in_(user_ids))
+    await db.execute(insert(DashboardRollup).from_select(["user_id"], missing))
+
+    query = (
+        update(DashboardRollup)
+        .values(**_rollup_expressions(today), overdue_as_of=today, rebuilt_at=func.now())
+        .returning(DashboardRollup.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if user_ids is not None:
+        query = query.where(DashboardRollup.user_id.in_(user_ids))
+
+    rebuilt = (await db.execute(query)).scalars().all()
+    if commit:
+        await db.commit()
+        await data_versions.bump_all(rebuilt)
+    return len(rebuilt)
+
+
+async def get_dashboard(db: AsyncSession, user_id: int) -> Dict:
+    """
+    ダッシュボード（集計行の主キー1件の読み取り、行がなければ再集計して作成）
+    """
+    rollup = await db.get(DashboardRollup, user_id)
+    if rollup is None:
+        await rebuild_rollups(db, [user_id])
+        rollup = await db.get(DashboardRollup, user_id)
+
+    return {
+        "projects": {
+            "total": rollup.projects_total,
+            **{status: getattr(rollup, f"projects_{status}") for status in PROJECT_STATUSES},
+            "overdue": rollup.projects_overdue,
+        },
+        "tasks": {
+            "total": rollup.tasks_total,
+            **{status: getattr(rollup, f"tasks_{status}") for status in TASK_STATUSES},
+            "overdue": rollup.tasks_overdue,
+        },
+        "budget_total": rollup.budget_total or Decimal(0),
+        "estimated_hours_total": rollup.estimated_hours_total or Decimal(0),
+        "actual_hours_total": rollup.actual_hours_total or Decimal(0),
+        "overdue_as_of": rollup.overdue_as_of,
+        "rebuilt_at": rollup.rebuilt_at,
+    }
+
+
+async def main() -> None:
+    async with SessionLocal() as db:
+        rebuilt = await rebuild_rollups(db)
+    await engine.dispose()
+    print(f"ダッシュボード集計を再集計しました: {rebuilt} 件")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
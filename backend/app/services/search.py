@@ -0,0 +1,122 @@
+"""
+案件検索サービス
+PostgreSQL: tsvector（GINインデックス）による全文検索・前方一致・ランキング
+その他（SQLite等）: Python実装の転置インデックスによる代替
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import Select, case, false, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+
+# tsvector の設定（日本語・英語混在のため言語依存の語幹処理をしない simple を使用）
+SEARCH_CONFIG = "simple"
+
+# フィールドごとの重み（tsvector の A/B/C に対応）
+FIELD_WEIGHTS = {
+    "title": 1.0,
+    "client_name": 0.4,
+    "tech_stack": 0.4,
+    "description": 0.2,
+}
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    検索語・本文を小文字の単語列に分割
+    """
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def build_tsquery(terms: Sequence[str]) -> str:
+    """
+    各語を前方一致で AND 結合した tsquery 文字列を作成
+    """
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class InvertedIndex:
+    """
+    転置インデックス（PostgreSQL 以外の代替検索）
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+
+    def add(self, doc_id: int, fields: Dict[str, object]) -> None:
+        for field, weight in FIELD_WEIGHTS.items():
+            value = fields.get(field)
+            if isinstance(value, (list, tuple)):
+                value = " ".join(value)
+            for token in tokenize(value or ""):
+                self.postings[token][doc_id] += weight
+
+    def search(self, terms: Sequence[str]) -> List[int]:
+        """
+        全語に前方一致する文書IDをスコア順に返す
+        """
+        scores: Dict[int, float] = {}
+        for i, term in enumerate(terms):
+            matched: Dict[int, float] = defaultdict(float)
+            for token, docs in self.postings.items():
+                if token.startswith(term):
+                    for doc_id, weight in docs.items():
+                        matched[doc_id] += weight
+            if i == 0:
+                scores = dict(matched)
+            else:
+                scores = {d: s + matched[d] for d, s in scores.items() if d in matched}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda d: (-scores[d], -d))
+
+
+async def apply_project_search(
+    db: AsyncSession,
+    query: Select,
+    search: str,
+) -> Tuple[Select, list]:
+    """
+    案件一覧クエリに検索条件を適用し、(クエリ, 関連度順の ORDER BY) を返す
+    """
+    terms = tokenize(search)
+    if not terms:
+        return query.where(false()), []
+
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery(SEARCH_CONFIG, build_tsquery(terms))
+        rank = func.ts_rank_cd(Project.search_vector, tsquery)
+        return (
+            query.where(Project.search_vector.op("@@")(tsquery)),
+            [rank.desc(), Project.id.desc()],
+        )
+
+    # 代替: 絞り込み済みの候補から転置インデックスを作成して順位付け
+    result = await db.execute(
+        query.with_only_columns(
+            Project.id,
+            Project.title,
+            Project.description,
+            Project.client_name,
+            Project.tech_stack,
+        )
+    )
+    index = InvertedIndex()
+    for row in result:
+        index.add(row.id, row._mapping)
+
+    ranked_ids = index.search(terms)
+    if not ranked_ids:
+        return query.where(false()), []
+
+    position = case(
+        {doc_id: pos for pos, doc_id in enumerate(ranked_ids)},
+        value=Project.id,
+    )
+    return query.where(Project.id.in_(ranked_ids)), [position]
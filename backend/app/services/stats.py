@@ -0,0 +1,139 @@
+"""
+統計集計サービス
+ステータス別件数を1回のクエリで集計
+"""
+
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.task import Task
+
+# ステータス一覧（統計のバケット）
+PROJECT_STATUSES = ("planning", "in_progress", "completed", "on_hold", "cancelled")
+TASK_STATUSES = ("todo", "in_progress", "completed", "blocked")
+
+# 期限切れ判定から除外する完了系ステータス
+PROJECT_CLOSED_STATUSES = ("completed", "cancelled")
+TASK_CLOSED_STATUSES = ("completed",)
+
+
+def _status_columns(count_target, status_column, statuses: Sequence[str]) -> list:
+    """
+    ステータスごとの COUNT(...) FILTER (WHERE status = ...) 列を生成
+    """
+    return [
+        func.count(count_target).filter(status_column == value).label(value)
+        for value in statuses
+    ]
+
+
+def project_overdue_condition(today: Optional[date] = None):
+    """
+    期限切れ案件の条件（終了日超過かつ未完了）
+    """
+    today = today or date.today()
+    return (Project.end_date < today) & Project.status.notin_(PROJECT_CLOSED_STATUSES)
+
+
+def task_overdue_condition(today: Optional[date] = None):
+    """
+    期限切れタスクの条件（期日超過かつ未完了）
+    """
+    today = today or date.today()
+    return (Task.due_date < today) & Task.status.notin_(TASK_CLOSED_STATUSES)
+
+
+async def get_project_stats(
+    db: AsyncSession,
+    user_id: int,
+    breakdowns: Sequence[str] = (),
+) -> Dict:
+    """
+    ユーザーの案件統計を集計
+    ステータス別件数（と期限切れ件数）は1クエリで取得
+    """
+    columns = [
+        func.count(Project.id).label("total"),
+        *_status_columns(Project.id, Project.status, PROJECT_STATUSES),
+    ]
+    if "overdue" in breakdowns:
+        columns.append(
+            func.count(Project.id).filter(project_overdue_condition()).label("overdue")
+        )
+
+    result = await db.execute(select(*columns).where(Project.user_id == user_id))
+    row = result.one()
+    stats = dict(row._mapping)
+
+    if "priority" in breakdowns:
+        result = await db.execute(
+            select(Project.priority, func.count(Project.id))
+            .where(Project.user_id == user_id)
+            .group_by(Project.priority)
+        )
+        rows = result.all()
+        stats["by_priority"] = {priority: count for priority, count in rows}
+
+    return stats
+
+
+async def get_task_stats(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    breakdowns: Sequence[str] = (),
+) -> Optional[Dict]:
+    """
+    案件のタスク統計を集計
+    所有者チェックも同じクエリで行い、案件が見つからなければ None を返す
+    """
+    columns = [
+        func.count(Task.id).label("total"),
+        *_status_columns(Task.id, Task.status, TASK_STATUSES),
+    ]
+    if "overdue" in breakdowns:
+        columns.append(
+            func.count(Task.id).filter(task_overdue_condition()).label("overdue")
+        )
+
+    # 案件に外部結合し、タスクが0件でも1行返るようにする
+    result = await db.execute(
+        select(*columns)
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .where(Project.id == project_id, Project.user_id == user_id)
+        .group_by(Project.id)
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        return None
+
+    stats = dict(row._mapping)
+
+    if "priority" in breakdowns:
+        result = await db.execute(
+            select(Task.priority, func.count(Task.id))
+            .where(Task.project_id == project_id)
+            .group_by(Task.priority)
+        )
+        rows = result.all()
+        stats["by_priority"] = {priority: count for priority, count in rows}
+
+    if "assignee" in breakdowns:
+        result = await db.execute(
+            select(Task.assigned_to, func.count(Task.id))
+            .where(Task.project_id == project_id)
+            .group_by(Task.assigned_to)
+        )
+        rows = result.all()
+        stats["by_assignee"] = [
+            {"assigned_to": assigned_to, "count": count}
+            for assigned_to, count in rows
+        ]
+
+    return stats
@@ -0,0 +1,152 @@
+"""
+差分同期サービス
+change_log（変更履歴）から同期トークン以降に変更された案件・タスクを求める
+読み取りはトークン以降の履歴と変更された行のみ（アカウントの全件数に依存しない）
+
+保持期間を過ぎた履歴の削除: python -m app.services.sync
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.change_log import ChangeLog
+from app.models.project import Project
+from app.models.task import Task
+
+
+async def current_token(db: AsyncSession, user_id: int) -> int:
+    """
+    最新の同期トークン（全件取得の前に取得しておき、以降の差分同期に使う）
+    seq は全ユーザー共通の採番のため、他ユーザーの seq を返すと、それより小さい seq で
+    コミット前の自分の変更を以降の同期で取りこぼす（自分の書き込みは seq の順にコミットされる）
+    """
+    result = await db.execute(
+        select(func.max(ChangeLog.seq)).where(ChangeLog.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+async def is_token_expired(
+    db: AsyncSession,
+    user_id: int,
+    since: int,
+    retention_days: int = settings.CHANGE_LOG_RETENTION_DAYS,
+) -> bool:
+    """
+    トークン以降の履歴が保持期間切れで削除されているか（全件の再取得が必要）
+    削除時はユーザーごとに保持期間切れの最新の1件を残すため、ユーザーの最古の履歴が
+    保持期間切れでトークンより後なら、その前の履歴が削除されている可能性がある
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    oldest = (await db.execute(
+        select(ChangeLog.seq, ChangeLog.changed_at < cutoff)
+        .where(ChangeLog.user_id == user_id)
+        .order_by(ChangeLog.seq)
+        .limit(1)
+    )).first()
+    return oldest is not None and since < oldest[0] and bool(oldest[1])
+
+
+def _latest_ops(rows) -> Tuple[Dict[str, List[int]], Dict[str, List[int]]]:
+    """
+    履歴を行ごとの最後の操作にまとめ、(作成・更新された id, 削除された id) を返す
+    """
+    latest: Dict[Tuple[str, int], str] = {}
+    for row in rows:
+        latest[(row.entity, row.entity_id)] = row.op
+    changed: Dict[str, List[int]] = {"project": [], "task": []}
+    deleted: Dict[str, List[int]] = {"project": [], "task": []}
+    for (entity, entity_id), op in latest.items():
+        target = deleted if op == "delete" else changed
+        target[entity].append(entity_id)
+    return changed, deleted
+
+
+async def get_changes(db: AsyncSession, user_id: int, since: int, limit: int) -> Dict:
+    """
+    since より後の変更（最大 limit 件の履歴分）
+    作成・更新された行は現在の値を、削除された行は id のみを返す
+    """
+    result = await db.execute(
+        select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op)
+        .where(ChangeLog.user_id == user_id, ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changed, deleted = _latest_ops(rows)
+
+    projects = []
+    if changed["project"]:
+        result = await db.execute(
+            select(Project).where(Project.id.in_(changed["project"]), Project.user_id == user_id)
+        )
+        projects = list(result.scalars().all())
+
+    tasks = []
+    if changed["task"]:
+        result = await db.execute(
+            select(Task)
+            .join(Task.project)
+            .where(Task.id.in_(changed["task"]), Project.user_id == user_id)
+        )
+        tasks = list(result.scalars().all())
+
+    # 取得範囲より後に削除された行（案件の削除で消えたタスクを含む）は削除として返す
+    found_projects = {project.id for project in projects}
+    found_tasks = {task.id for task in tasks}
+    deleted["project"] += [i for i in changed["project"] if i not in found_projects]
+    deleted["task"] += [i for i in changed["task"] if i not in found_tasks]
+
+    return {
+        "token": str(rows[-1].seq if rows else since),
+        "has_more": has_more,
+        "projects": projects,
+        "tasks": tasks,
+        "deleted": {"projects": deleted["project"], "tasks": deleted["task"]},
+    }
+
+
+async def prune_change_log(db: AsyncSession, retention_days: int) -> int:
+    """
+    保持期間を過ぎた履歴を削除
+    期限切れの判定のため、ユーザーごとに保持期間切れの最新の1件は残す
+    （その seq 以上のトークンは有効、未満のトークンは期限切れ）
+    削除した件数を返す
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    kept = aliased(ChangeLog)
+    result = await db.execute(
+        delete(ChangeLog)
+        .where(
+            ChangeLog.changed_at < cutoff,
+            ChangeLog.seq < (
+                select(func.max(kept.seq))
+                .where(kept.user_id == ChangeLog.user_id, kept.changed_at < cutoff)
+                .scalar_subquery()
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def main() -> None:
+    async with SessionLocal() as db:
+        pruned = await prune_change_log(db, settings.CHANGE_LOG_RETENTION_DAYS)
+    await engine.dispose()
+    print(f"変更履歴を削除しました: {pruned} 件")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,259 @@
+"""
+タスク一括操作サービス
+作成・更新・削除をまとめて検証し、種類ごとに1文（executemany）で実行
+案件のタスク件数カウンタ・ダッシュボード集計も種類ごとに1文ずつで増減する
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.schemas.task import TaskBatchOperation, TaskCreate, TaskUpdate
+from app.services.dashboard import TASK_FIELDS, RollupDelta, apply_rollup_delta, snapshot
+from app.services.task_counters import TaskCounterDelta, apply_delta
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _database_error(exc: SQLAlchemyError) -> str:
+    return f"データベースエラー: {exc.__class__.__name__}"
+
+
+def _task_fields(values: Dict) -> Dict:
+    # 集計に関わる項目のみ（更新では指定された項目のみ）
+    return {field: values[field] for field in TASK_FIELDS if field in values}
+
+
+class TaskBatch:
+    """
+    1回のバッチ処理の状態（操作ごとの結果を保持）
+    """
+
+    def __init__(self, project_id: int, operations: Sequence[TaskBatchOperation], user_id: int):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.results: List[Dict] = [
+            {"index": i, "op": op.op, "status": 0, "id": op.id, "error": None}
+            for i, op in enumerate(operations)
+        ]
+        self.creates: List[Tuple[int, Dict]] = []
+        self.updates: List[Tuple[int, Dict]] = []
+        self.deletes: List[Tuple[int, int]] = []
+        # 更新・削除対象の現在の値（タスク件数カウンタ・ダッシュボード集計の増減用）
+        self.current: Dict[int, Dict] = {}
+        self._parse(operations)
+
+    def fail(self, index: int, status_code: int, message: str) -> None:
+        self.results[index].update(status=status_code, error=message)
+
+    @property
+    def has_errors(self) -> bool:
+        return any(r["error"] for r in self.results)
+
+    def _parse(self, operations: Sequence[TaskBatchOperation]) -> None:
+        """
+        各操作を検証して種類ごとに振り分ける（DBアクセスなし）
+        """
+        seen_ids = set()
+        for i, operation in enumerate(operations):
+            if operation.op == "create":
+                data = dict(operation.data or {})
+                data.setdefault("project_id", self.project_id)
+                try:
+                    task_data = TaskCreate.model_validate(data)
+                except ValidationError as exc:
+                    self.fail(i, 422, _validation_message(exc))
+                    continue
+                if task_data.project_id != self.project_id:
+                    self.fail(i, 400, "URLのproject_idとリクエストボディのproject_idが一致しません")
+                    continue
+                self.creates.append((i, task_data.model_dump()))
+                continue
+
+            if operation.id is None:
+                self.fail(i, 400, "id を指定してください")
+                continue
+            if operation.id in seen_ids:
+                self.fail(i, 400, f"タスクID {operation.id} がバッチ内で重複しています")
+                continue
+            seen_ids.add(operation.id)
+
+            if operation.op == "update":
+                try:
+                    task_data = TaskUpdate.model_validate(operation.data or {})
+                except ValidationError as exc:
+                    self.fail(i, 422, _validation_message(exc))
+                    continue
+                self.updates.append(
+                    (i, {"id": operation.id, **task_data.model_dump(exclude_unset=True)})
+                )
+            else:
+                self.deletes.append((i, operation.id))
+
+    async def check_targets(self, db: AsyncSession) -> None:
+        """
+        更新・削除対象が案件内に存在するかを1クエリで確認（集計に関わる現在の値も取得）
+        """
+        target_ids = [values["id"] for _, values in self.updates]
+        target_ids += [task_id for _, task_id in self.deletes]
+        if not target_ids:
+            return
+
+        result = await db.execute(
+            select(Task.id, *(getattr(Task, field) for field in TASK_FIELDS)).where(
+                Task.project_id == self.project_id,
+                Task.id.in_(target_ids),
+            )
+        )
+        self.current = {row.id: snapshot(row, TASK_FIELDS) for row in result.all()}
+
+        def keep(index: int, task_id: int) -> bool:
+            if task_id in self.current:
+                return True
+            self.fail(index, 404, f"タスクID {task_id} が見つかりません")
+            return False
+
+        self.updates = [(i, v) for i, v in self.updates if keep(i, v["id"])]
+        self.deletes = [(i, t) for i, t in self.deletes if keep(i, t)]
+
+    async def _run_creates(self, db: AsyncSession, items: List[Tuple[int, Dict]]) -> None:
+        result = await db.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [values for _, values in items],
+        )
+        for (i, _), task_id in zip(items, result.scalars().all()):
+            self.results[i].update(status=201, id=task_id)
+
+        counters, rollup = TaskCounterDelta(), RollupDelta()
+        for _, values in items:
+            counters.added(values["status"])
+            rollup.task_changed(None, _task_fields(values))
+        await self._apply_deltas(db, counters, rollup)
+
+    async def _run_updates(self, db: AsyncSession, items: List[Tuple[int, Dict]]) -> None:
+        # 変更項目のない更新は実行しない
+        rows = [values for _, values in items if len(values) > 1]
+        if rows:
+            await db.execute(update(Task), rows)
+        for i, _ in items:
+            self.results[i]["status"] = 200
+
+        counters, rollup = TaskCounterDelta(), RollupDelta()
+        for row in rows:
+            old = self.current[row["id"]]
+            if "status" in row:
+                counters.moved(old["status"], row["status"])
+            rollup.task_changed(old, {**old, **_task_fields(row)})
+        await self._apply_deltas(db, counters, rollup)
+
+    async def _run_deletes(self, db: AsyncSession, items: List[Tuple[int, int]]) -> None:
+        await db.execute(
+            delete(Task)
+            .where(Task.id.in_([task_id for _, task_id in items]))
+            .execution_options(synchronize_session=False)
+        )
+        for i, _ in items:
+            self.results[i]["status"] = 204
+
+        counters, rollup = TaskCounterDelta(), RollupDelta()
+        for _, task_id in items:
+            counters.removed(self.current[task_id]["status"])
+            rollup.task_changed(self.current[task_id], None)
+        await self._apply_deltas(db, counters, rollup)
+
+    async def _apply_deltas(self, db: AsyncSession, counters: TaskCounterDelta, rollup: RollupDelta) -> None:
+        await apply_delta(db, self.project_id, counters)
+        await apply_rollup_delta(db, self.user_id, rollup)
+
+    async def execute(self, db: AsyncSession, atomic: bool) -> bool:
+        """
+        検証済みの操作を実行し、適用されたかどうかを返す（コミットは呼び出し側）
+        atomic=False の場合は種類ごとにセーブポイントを切り、失敗した種類は
+        1件ずつセーブポイントを切って再実行して、失敗した操作のみ取り消す
+        """
+        await self.check_targets(db)
+
+        if atomic and self.has_errors:
+            self._mark_not_applied("バッチ内の他の操作が失敗したため適用されませんでした")
+            return False
+
+        groups = [
+            (self.creates, self._run_creates),
+            (self.updates, self._run_updates),
+            (self.deletes, self._run_deletes),
+        ]
+        for items, run in groups:
+            if not items:
+                continue
+            try:
+                if atomic:
+                    await run(db, items)
+                else:
+                    async with db.begin_nested():
+                        await run(db, items)
+            except SQLAlchemyError as exc:
+                if not atomic:
+                    await self._run_each(db, items, run)
+                    continue
+                await db.rollback()
+                for i, _ in items:
+                    self.fail(i, 400, _database_error(exc))
+                self._mark_not_applied("バッチ内の他の操作が失敗したため適用されませんでした")
+                return False
+
+        return any(r["error"] is None for r in self.results)
+
+    async def _run_each(self, db: AsyncSession, items: List[Tuple[int, Any]], run) -> None:
+        """
+        1件ずつセーブポイントを切って実行（失敗した操作の番号にエラーを記録）
+        """
+        for item in items:
+            try:
+                async with db.begin_nested():
+                    await run(db, [item])
+            except SQLAlchemyError as exc:
+                i = item[0]
+                self.fail(i, 400, _database_error(exc))
+                if self.results[i]["op"] == "create":
+                    self.results[i]["id"] = None
+
+    def _mark_not_applied(self, message: str) -> None:
+        for result in self.results:
+            if result["error"] is None:
+                result.update(status=424, error=message)
+                if result["op"] == "create":
+                    result["id"] = None
+
+    def changes(self) -> List[Tuple[int, str, Optional[List[str]]]]:
+        """
+        適用された操作の (タスクID, 操作, 更新項目) 一覧（変更通知用）
+        """
+        changes = []
+        for i, _ in self.creates:
+            if self.results[i]["error"] is None:
+                changes.append((self.results[i]["id"], "create", None))
+        for i, values in self.updates:
+            if self.results[i]["error"] is None:
+                changes.append((values["id"], "update", [key for key in values if key != "id"]))
+        for i, task_id in self.deletes:
+            if self.results[i]["error"] is None:
+                changes.append((task_id, "delete", None))
+        return changes
+
+    def summary(self, applied: bool) -> Dict:
+        failed = sum(1 for r in self.results if r["error"])
+        return {
+            "applied": applied,
+            "succeeded": len(self.results) - failed,
+            "failed": failed,
+            "results": self.results,
+        }
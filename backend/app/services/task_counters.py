@@ -0,0 +1,144 @@
+"""
+案件のタスク件数カウンタ
+タスクの作成・更新・削除と同じトランザクションで projects のカウンタ列を増減し、
+ずれが生じた場合は集計し直して修復する
+
+修復ジョブ: python -m app.services.task_counters
+"""
+
+import asyncio
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import data_versions
+from app.database import SessionLocal, engine
+from app.models.project import Project
+from app.models.task import Task
+from app.services.stats import TASK_STATUSES
+
+# ステータス → カウンタ列（その他のステータスは task_total のみに数える）
+STATUS_COLUMNS = {status: f"task_{status}" for status in TASK_STATUSES}
+
+# ProjectResponse に含められるカウンタ項目
+TASK_COUNT_FIELDS = ("task_total", *STATUS_COLUMNS.values(), "progress")
+
+
+class TaskCounterDelta:
+    """
+    1案件分のカウンタの増減
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_status: Counter = Counter()
+
+    def added(self, status: str, count: int = 1) -> None:
+        self.total += count
+        self.by_status[status] += count
+
+    def removed(self, status: str, count: int = 1) -> None:
+        self.added(status, -count)
+
+    def moved(self, old_status: str, new_status: str) -> None:
+        if old_status != new_status:
+            self.by_status[old_status] -= 1
+            self.by_status[new_status] += 1
+
+    def values(self) -> Dict:
+        """
+        UPDATE の SET 句（列 = 列 + 増減、変化のない列は含めない）
+        """
+        deltas = {"task_total": self.total}
+        for status, count in self.by_status.items():
+            column = STATUS_COLUMNS.get(status)
+            if column:
+                deltas[column] = count
+        return {
+            column: getattr(Project, column) + count
+            for column, count in deltas.items()
+            if count
+        }
+
+
+async def apply_delta(db: AsyncSession, project_id: int, delta: TaskCounterDelta) -> None:
+    """
+    カウンタを増減（同時更新でも失われないよう列の加算で更新、コミットは呼び出し側）
+    """
+    values = delta.values()
+    if not values:
+        return
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        # カウンタの更新で案件の更新日時（一覧の並び順）を変えない
+        .values(**values, updated_at=Project.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_status_change(
+    db: AsyncSession,
+    project_id: int,
+    old_status: Optional[str],
+    new_status: Optional[str],
+) -> None:
+    """
+    タスク1件の変更をカウンタに反映（old_status=None は作成、new_status=None は削除）
+    """
+    delta = TaskCounterDelta()
+    if old_status is None:
+        delta.added(new_status)
+    elif new_status is None:
+        delta.removed(old_status)
+    else:
+        delta.moved(old_status, new_status)
+    await apply_delta(db, project_id, delta)
+
+
+def _count(status: Optional[str] = None):
+    query = select(func.count(Task.id)).where(Task.project_id == Project.id)
+    if status is not None:
+        query = query.where(Task.status == status)
+    return query.scalar_subquery()
+
+
+async def reconcile_task_counters(
+    db: AsyncSession,
+    project_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    tasks から集計し直し、ずれている案件のカウンタを修復
+    修復した案件の所有者のデータバージョンを進め、ETag・キャッシュ済みの一覧が古い件数を返さないようにする
+    修復した案件数を返す
+    """
+    expected = {"task_total": _count()}
+    expected.update({column: _count(status) for status, column in STATUS_COLUMNS.items()})
+
+    query = (
+        update(Project)
+        .where(or_(*(getattr(Project, column) != value for column, value in expected.items())))
+        .values(**expected, updated_at=Project.updated_at)
+        .returning(Project.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if project_ids is not None:
+        query = query.where(Project.id.in_(list(project_ids)))
+
+    owners = (await db.execute(query)).scalars().all()
+    await db.commit()
+    await data_versions.bump_all(owners)
+    return len(owners)
+
+
+async def main() -> None:
+    async with SessionLocal() as db:
+        repaired = await reconcile_task_counters(db)
+    await engine.dispose()
+    print(f"タスク件数カウンタを修復しました: {repaired} 件")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
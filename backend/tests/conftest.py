@@ -0,0 +1,70 @@
+"""
+テスト共通設定
+一時ファイルの SQLite にスキーマを作成し、アプリを TestClient で起動する
+（設定はアプリの import 前に環境変数で指定する）
+"""
+
+import os
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="pms-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_DIR}/primary.db"
+os.environ["DEBUG"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PASSWORD_HASH_WORKERS"] = "1"
+os.environ["LOGIN_RATE_LIMIT_PER_IP"] = "100000"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models  # noqa: F401  モデルをメタデータに登録
+from app.database import engine
+from app.main import app
+
+from tests.helpers import auth_headers, create_schema
+
+pytest_plugins = ["app.pytest_plugin"]
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # 案件削除時のタスクの削除（ON DELETE CASCADE）を SQLite でも有効にする
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    アプリのクライアント（テスト全体で1つ、DBもテスト全体で共有する）
+    各テストは新しいユーザーで実行するため、データ・キャッシュは互いに影響しない
+    """
+    with TestClient(app) as test_client:
+        test_client.portal.call(create_schema, engine)
+        yield test_client
+
+
+@pytest.fixture
+def run(client):
+    """
+    非同期関数をアプリと同じイベントループで実行（DBの直接操作用）
+    """
+    return client.portal.call
+
+
+@pytest.fixture
+def headers(client):
+    return auth_headers(client)
+
+
+@pytest.fixture
+def project(client, headers):
+    response = client.post(
+        "/api/v1/projects/",
+        json={"title": "テスト案件", "status": "planning", "priority": "medium"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,43 @@
+"""
+テスト用のヘルパー
+"""
+
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import Base
+
+
+async def create_schema(target_engine: AsyncEngine) -> None:
+    async with target_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def auth_headers(client: TestClient) -> dict:
+    """
+    新しいユーザーを登録してログインし、認証ヘッダーを返す
+    """
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": "tester", "password": "password1"},
+    )
+    assert response.status_code == 201, response.text
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": "password1"},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_task(client: TestClient, headers: dict, project_id: int, **values) -> dict:
+    response = client.post(
+        f"/api/v1/project/{project_id}/tasks",
+        json={"title": "タスク", "project_id": project_id, **values},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
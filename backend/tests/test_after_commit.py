@@ -0,0 +1,44 @@
+"""
+コミット後の処理（AppSession.commit）のテスト
+"""
+
+import logging
+
+import pytest
+
+from app.core import events
+from app.database import SessionLocal, after_commit
+
+
+@pytest.mark.asyncio
+async def test_failed_callback_does_not_skip_others_or_raise(caplog):
+    calls = []
+    
+    async def failing():
+        calls.append("failing")
+        raise RuntimeError("cache down")
+    
+    async def succeeding():
+        calls.append("succeeding")
+    
+    async with SessionLocal() as db:
+        after_commit(db.sync_session, failing)
+        after_commit(db.sync_session, succeeding)
+        with caplog.at_level(logging.ERROR, logger="app.database"):
+            await db.commit()
+    
+    assert calls == ["failing", "succeeding"]
+    assert "cache down" in caplog.text
+
+
+def test_write_succeeds_when_publishing_fails(client, headers, monkeypatch):
+    async def publish(user_id, item):
+        raise ConnectionError("event bus down")
+    
+    monkeypatch.setattr(events.change_bus, "publish", publish)
+    before = client.get("/api/v1/projects/stats", headers=headers).json()["total"]
+    
+    response = client.post("/api/v1/projects/", json={"title": "a"}, headers=headers)
+    
+    assert response.status_code == 201
+    assert client.get("/api/v1/projects/stats", headers=headers).json()["total"] == before + 1
@@ -0,0 +1,63 @@
+"""
+キャッシュバックエンドのテスト（プロセス内・共有キャッシュで同じ動作になること）
+"""
+
+import pytest
+
+from app.core.cache import InMemoryCache, LocalSharedStore, SharedCache
+from app.core.etag import DataVersions
+from app.core.events import EventIds
+
+
+@pytest.fixture(params=["memory", "shared"])
+def backend(request):
+    if request.param == "memory":
+        return InMemoryCache(maxsize=100)
+    return SharedCache(LocalSharedStore(), "test")
+
+
+@pytest.mark.asyncio
+async def test_get_set_add_delete(backend):
+    assert await backend.get("a") is None
+    await backend.set("a", {"value": 1})
+    assert await backend.get("a") == {"value": 1}
+    
+    assert await backend.add("lock", 1, ttl=10)
+    assert not await backend.add("lock", 1, ttl=10)
+    await backend.delete("lock")
+    assert await backend.add("lock", 1, ttl=10)
+
+
+@pytest.mark.asyncio
+async def test_incr_starts_from_initial(backend):
+    assert await backend.incr("counter", amount=0, initial=100) == 100
+    assert await backend.incr("counter", initial=100) == 101
+    assert await backend.incr("counter", amount=5) == 106
+
+
+@pytest.mark.asyncio
+async def test_delete_prefix(backend):
+    await backend.set("principal:1:a", 1)
+    await backend.set("principal:1:b", 2)
+    await backend.set("principal:2:a", 3)
+    
+    await backend.delete_prefix("principal:1:")
+    
+    assert await backend.get("principal:1:a") is None
+    assert await backend.get("principal:1:b") is None
+    assert await backend.get("principal:2:a") == 3
+
+
+@pytest.mark.asyncio
+async def test_user_counters_are_seeded_from_time_and_independent(backend):
+    versions = DataVersions(backend)
+    ids = EventIds(backend)
+    
+    version = await versions.get(1)
+    assert version > 10 ** 15  # 現在時刻（マイクロ秒）から始まる
+    assert await versions.bump(1) == version + 1
+    
+    # 同じバックエンドでもキーが分かれている
+    latest = await ids.latest(1)
+    assert await ids.next(1) == latest + 1
+    assert await versions.get(1) == version + 1
@@ -0,0 +1,35 @@
+"""
+ダッシュボード集計のテスト
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models.project import Project
+from app.services import dashboard as dashboard_service
+
+
+def test_nightly_rebuild_invalidates_dashboard_etag(client, headers, project, run):
+    response = client.get("/api/v1/dashboard/", headers=headers)
+    etag = response.headers["ETag"]
+    assert response.json()["projects"]["overdue"] == 0
+    
+    async def pass_end_date_and_rebuild():
+        # 終了日を過ぎた状態（日付の変わり目）を再現し、毎晩の再集計を実行する
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Project)
+                .where(Project.id == project["id"])
+                .values(end_date=date.today() - timedelta(days=1))
+            )
+            await db.commit()
+            await dashboard_service.rebuild_rollups(db)
+    
+    run(pass_end_date_and_rebuild)
+    
+    # 再集計前の ETag では 304 にならず、再集計後の件数が返る
+    response = client.get("/api/v1/dashboard/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["projects"]["overdue"] == 1
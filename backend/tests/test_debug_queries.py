@@ -0,0 +1,10 @@
+"""
+クエリ計測レポートの公開範囲のテスト
+"""
+
+from app.config import settings
+
+
+def test_debug_queries_is_not_exposed_without_debug(client):
+    assert not settings.DEBUG
+    assert client.get("/debug/queries").status_code == 404
@@ -0,0 +1,72 @@
+"""
+変更通知（SSE / WebSocket）のテスト
+"""
+
+import tracemalloc
+
+import pytest
+
+from app.api.v1.events import _sse_stream
+from app.config import settings
+from app.core.events import ChangeBroker, change_broker
+
+USER_ID = 10_000_002
+
+
+@pytest.mark.asyncio
+async def test_sse_subscribes_only_while_streaming():
+    stream = _sse_stream(USER_ID, None)
+    # 応答の送信前に切断された場合はジェネレーターが動かず、購読も残らない
+    assert USER_ID not in change_broker._subscribers
+    
+    assert await stream.__anext__() == b"retry: 3000\n\n"
+    assert len(change_broker._subscribers[USER_ID]) == 1
+    
+    await stream.aclose()
+    assert USER_ID not in change_broker._subscribers
+
+
+def test_websocket_sends_ping_while_idle(client, headers, monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_HEARTBEAT_SECONDS", 0.05)
+    token = headers["Authorization"].split()[1]
+    
+    with client.websocket_connect(f"/api/v1/events/ws?access_token={token}") as websocket:
+        assert websocket.receive_json() == {"type": "ping"}
+        
+        created = client.post("/api/v1/projects/", json={"title": "a"}, headers=headers).json()
+        item = websocket.receive_json()
+        while item == {"type": "ping"}:
+            item = websocket.receive_json()
+        assert (item["entity"], item["entity_id"], item["op"]) == ("project", created["id"], "create")
+
+
+# 1接続あたりのメモリの上限（キュー・購読の管理を含む）
+SUBSCRIBER_MEMORY_BUDGET = 4 * 1024
+
+
+@pytest.mark.asyncio
+async def test_idle_subscribers_stay_within_memory_budget():
+    broker = ChangeBroker(queue_size=100, replay_size=200, replay_users=10000)
+    count = 5000
+    
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        subscriptions = [broker.subscribe(USER_ID + i % 100) for i in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    assert broker.stats()["connections"] == count
+    assert (after - before) / count < SUBSCRIBER_MEMORY_BUDGET
+    
+    for subscription in subscriptions:
+        broker.unsubscribe(subscription)
+    assert broker.stats()["connections"] == 0
+
+
+def test_connections_are_exported_as_a_gauge(client):
+    body = client.get("/metrics").text
+    
+    assert "# TYPE change_events_connections gauge" in body
+    assert "change_events_connections_total" not in body
@@ -0,0 +1,84 @@
+"""
+エクスポートのテスト（ストリーミング出力のメモリ上限）
+"""
+
+import json
+import tracemalloc
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.api.v1.export import TASK_COLUMNS, _stream_rows
+from app.database import engine
+from app.models.project import Project
+from app.models.task import Task
+
+# 件数に関係なく一定に収まるべきメモリの上限（取得単位 EXPORT_BATCH_SIZE 行分の変換を含む）
+EXPORT_MEMORY_BUDGET = 4 * 1024 * 1024
+
+
+def user_id_of(client, headers) -> int:
+    return client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+
+async def seed_tasks(project_id: int, count: int) -> None:
+    async with engine.begin() as conn:
+        for start in range(0, count, 5000):
+            await conn.execute(
+                insert(Task),
+                [
+                    {"project_id": project_id, "title": f"タスク{i}", "status": "todo", "priority": "medium"}
+                    for i in range(start, min(start + 5000, count))
+                ],
+            )
+
+
+def task_query(user_id: int):
+    return (
+        select(*[getattr(Task, name) for name in TASK_COLUMNS])
+        .join(Task.project)
+        .where(Project.user_id == user_id)
+        .order_by(Task.project_id, Task.id)
+    )
+
+
+async def measure_export(user_id: int, export_format: str):
+    """
+    エクスポートを最後まで読み、(行数, tracemalloc のピーク) を返す（出力は保持しない）
+    """
+    lines = 0
+    tracemalloc.start()
+    try:
+        async for chunk in _stream_rows(task_query(user_id), TASK_COLUMNS, export_format):
+            lines += chunk.count(b"\n" if isinstance(chunk, bytes) else "\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return lines, peak
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_memory_does_not_grow_with_row_count(client, headers, project, run, export_format):
+    count = 20_000
+    run(seed_tasks, project["id"], count)
+    user_id = user_id_of(client, headers)
+    
+    lines, peak = run(measure_export, user_id, export_format)
+    
+    assert lines == count + (1 if export_format == "csv" else 0)
+    assert peak < EXPORT_MEMORY_BUDGET, f"peak {peak / 1024 / 1024:.1f} MiB"
+
+
+def test_ndjson_rows_match_task_response(client, headers, project):
+    client.post(
+        f"/api/v1/project/{project['id']}/tasks",
+        json={"title": "タスク", "project_id": project["id"], "estimated_hours": "1.5"},
+        headers=headers,
+    )
+    
+    response = client.get("/api/v1/export/tasks", headers=headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [(row["title"], row["estimated_hours"]) for row in rows] == [("タスク", "1.50")]
+    assert set(rows[0]) == set(TASK_COLUMNS)
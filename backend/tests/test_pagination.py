@@ -0,0 +1,114 @@
+"""
+キーセット（カーソル）ページネーションのテスト
+"""
+
+import base64
+import json
+
+import pytest
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+from tests.helpers import create_task
+
+
+def fetch_all_pages(client, url, headers, limit):
+    """
+    X-Next-Cursor をたどって全ページを取得（ページごとの id の一覧を返す）
+    """
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        assert len(pages) <= 20, "ページ送りが終わらない"
+
+
+def test_task_pages_cover_all_tasks_in_creation_order(client, headers, project):
+    task_ids = [create_task(client, headers, project["id"], title=f"t{i}")["id"] for i in range(10)]
+    
+    pages = fetch_all_pages(client, f"/api/v1/project/{project['id']}/tasks", headers, limit=3)
+    
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [task_id for page in pages for task_id in page] == task_ids
+
+
+def test_project_pages_follow_updated_order(client, headers):
+    project_ids = []
+    for i in range(8):
+        response = client.post("/api/v1/projects/", json={"title": f"p{i}"}, headers=headers)
+        project_ids.append(response.json()["id"])
+    # 更新した案件は更新日時で先頭に並ぶ
+    for project_id in (project_ids[2], project_ids[5]):
+        response = client.put(f"/api/v1/projects/{project_id}", json={"status": "in_progress"}, headers=headers)
+        assert response.status_code == 200, response.text
+    
+    pages = fetch_all_pages(client, "/api/v1/projects/", headers, limit=3)
+    
+    ordered = [project_id for page in pages for project_id in page]
+    untouched = [p for p in reversed(project_ids) if p not in (project_ids[2], project_ids[5])]
+    assert ordered == [project_ids[5], project_ids[2], *untouched]
+    assert [len(page) for page in pages] == [3, 3, 2]
+
+
+def test_last_page_has_no_cursor(client, headers, project):
+    for i in range(3):
+        create_task(client, headers, project["id"])
+    
+    response = client.get(f"/api/v1/project/{project['id']}/tasks", params={"limit": 3}, headers=headers)
+    
+    assert len(response.json()) == 3
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_invalid_cursor_is_rejected(client, headers, project):
+    response = client.get(
+        f"/api/v1/project/{project['id']}/tasks",
+        params={"cursor": "not-a-cursor"},
+        headers=headers,
+    )
+    
+    assert response.status_code == 400
+
+
+def crafted_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("values", [
+    ["x", 1],
+    [{"dt": "2024-01-01T00:00:00"}, "1"],
+    [{"d": "2024-01-01"}, 1],
+    [1, 1],
+    [{"dt": "2024-01-01T00:00:00"}, True],
+])
+def test_cursor_values_must_match_sort_column_types(client, headers, project, values):
+    for url in (f"/api/v1/project/{project['id']}/tasks", "/api/v1/projects/"):
+        response = client.get(url, params={"cursor": crafted_cursor(values)}, headers=headers)
+        assert response.status_code == 400, (url, response.text)
+
+
+@pytest.mark.parametrize("values", [
+    ["x", 1],
+    [{"dt": "2024-01-01T00:00:00"}, 1],
+    [20240101, 1],
+    [{"d": "2024-01-01"}, "1"],
+    [None, None],
+])
+def test_assigned_cursor_due_date_must_be_a_date_or_null(client, headers, values):
+    response = client.get("/api/v1/tasks/assigned", params={"cursor": crafted_cursor(values)}, headers=headers)
+    
+    assert response.status_code == 400, response.text
+
+
+def test_assigned_cursor_accepts_dates_and_null(client, headers):
+    for values in ([{"d": "2024-01-01"}, 1], [None, 1]):
+        response = client.get("/api/v1/tasks/assigned", params={"cursor": crafted_cursor(values)}, headers=headers)
+        assert response.status_code == 200, response.text
@@ -0,0 +1,51 @@
+"""
+案件詳細（include=tasks,stats）のテスト
+"""
+
+from tests.helpers import create_task
+
+
+def get_detail(client, headers, project_id):
+    response = client.get(
+        f"/api/v1/projects/{project_id}",
+        params={"include": "tasks,stats"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_detail_includes_tasks_and_stats(client, headers, project):
+    create_task(client, headers, project["id"], status="todo")
+    create_task(client, headers, project["id"], status="completed")
+    
+    body = get_detail(client, headers, project["id"])
+    
+    assert body["id"] == project["id"]
+    assert len(body["tasks"]) == 2
+    assert (body["stats"]["total"], body["stats"]["todo"], body["stats"]["completed"]) == (2, 1, 1)
+
+
+def test_detail_query_count_does_not_grow_with_tasks(client, headers, project, assert_max_queries):
+    create_task(client, headers, project["id"])
+    # 所有者チェックを兼ねた案件取得・タスクの selectinload・集計の3クエリ
+    with assert_max_queries(3) as few:
+        get_detail(client, headers, project["id"])
+    
+    for i in range(20):
+        create_task(client, headers, project["id"], title=f"t{i}")
+    with assert_max_queries(3) as many:
+        body = get_detail(client, headers, project["id"])
+    
+    assert len(body["tasks"]) == 21
+    assert many.count == few.count
+
+
+def test_unknown_include_is_rejected(client, headers, project):
+    response = client.get(
+        f"/api/v1/projects/{project['id']}",
+        params={"include": "comments"},
+        headers=headers,
+    )
+    
+    assert response.status_code == 400
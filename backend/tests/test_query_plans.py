@@ -0,0 +1,132 @@
+"""
+ルーターのクエリがインデックスを使うことの検査
+シードしたDBで各エンドポイントを呼び、実行されたクエリを EXPLAIN して全件走査がないことを確認する
+（SQLite の EXPLAIN QUERY PLAN で、PostgreSQL の Seq Scan に相当する "SCAN <テーブル>" を検出する）
+"""
+
+import re
+from datetime import date, timedelta
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.engine import Engine
+
+from app.database import Base, engine
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+TABLES = set(Base.metadata.tables)
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+class StatementRecorder:
+    """
+    with ブロック内で実行された SELECT 文とパラメータを記録
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+
+async def seed(user_id: int) -> None:
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            insert(Project).returning(Project.id),
+            [
+                {
+                    "user_id": user_id,
+                    "title": f"案件{i}",
+                    "status": ("planning", "in_progress", "completed")[i % 3],
+                    "priority": ("low", "medium", "high")[i % 3],
+                    "end_date": date(2026, 1, 1) + timedelta(days=i),
+                }
+                for i in range(30)
+            ],
+        )
+        project_ids = list(result.scalars())
+        await conn.execute(
+            insert(Task),
+            [
+                {
+                    "project_id": project_id,
+                    "title": f"タスク{j}",
+                    "status": ("todo", "in_progress", "completed", "blocked")[j % 4],
+                    "priority": "medium",
+                    "due_date": date(2026, 1, 1) + timedelta(days=j) if j % 5 else None,
+                    "assigned_to": user_id if j % 2 else None,
+                }
+                for project_id in project_ids
+                for j in range(20)
+            ],
+        )
+
+
+async def explain(statements):
+    """
+    (SQL, 全件走査していたテーブル) の一覧
+    """
+    scans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            for row in result:
+                match = FULL_SCAN.match(row[-1])
+                if match and match.group(1) in TABLES:
+                    scans.append((statement, row[-1]))
+    return scans
+
+
+def test_router_queries_use_indexes(client, headers, run):
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    run(seed, user_id)
+    project_id = client.get("/api/v1/projects/", params={"limit": 1}, headers=headers).json()[0]["id"]
+    
+    with StatementRecorder() as recorder:
+        first_page = client.get("/api/v1/projects/", params={"limit": 10}, headers=headers)
+        client.get(
+            "/api/v1/projects/",
+            params={"limit": 10, "cursor": first_page.headers[NEXT_CURSOR_HEADER]},
+            headers=headers,
+        )
+        client.get(
+            "/api/v1/projects/",
+            params={"status": "planning", "priority": "low", "skip": 1},
+            headers=headers,
+        )
+        client.get("/api/v1/projects/stats", params={"breakdown": ["priority", "overdue"]}, headers=headers)
+        client.get(f"/api/v1/projects/{project_id}", params={"include": "tasks,stats"}, headers=headers)
+        
+        tasks_page = client.get(f"/api/v1/project/{project_id}/tasks", params={"limit": 5}, headers=headers)
+        client.get(
+            f"/api/v1/project/{project_id}/tasks",
+            params={"limit": 5, "cursor": tasks_page.headers[NEXT_CURSOR_HEADER]},
+            headers=headers,
+        )
+        client.get(f"/api/v1/project/{project_id}/tasks", params={"status": "todo"}, headers=headers)
+        client.get(
+            f"/api/v1/project/{project_id}/tasks/stats",
+            params={"breakdown": ["priority", "assignee", "overdue"]},
+            headers=headers,
+        )
+        task_id = tasks_page.json()[0]["id"]
+        client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        client.get("/api/v1/tasks/assigned", params={"status": "todo", "limit": 5}, headers=headers)
+        client.get("/api/v1/dashboard/", headers=headers)
+        client.get("/api/v1/export/projects", headers=headers)
+        client.get("/api/v1/export/tasks", headers=headers)
+    
+    assert recorder.statements
+    scans = run(explain, recorder.statements)
+    assert not scans, "\n\n".join(f"{detail}\n{statement}" for statement, detail in scans)
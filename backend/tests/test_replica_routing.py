@@ -0,0 +1,125 @@
+"""
+読み取りレプリカへの振り分けのテスト
+プライマリとレプリカを別々の SQLite ファイルにし、同じタスクのタイトルを変えておくことで
+どちらのDBから読んだかを判別する
+"""
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import database
+from app.config import settings
+from app.core.cache import InMemoryCache, LocalSharedStore, SharedCache
+from app.database import ReplicaRouter, create_engine_for, engine, replica_router
+from app.main import check_worker_settings
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+from tests.helpers import create_schema, create_task
+
+
+async def copy_to_replica(replica_engine, user_id: int, title: str) -> None:
+    """
+    ユーザー・案件・タスクをレプリカに複製（タスクのタイトルのみ変える）
+    """
+    async with engine.connect() as primary:
+        users = (await primary.execute(select(User.__table__).where(User.id == user_id))).mappings().all()
+        projects = (await primary.execute(
+            select(Project.__table__).where(Project.user_id == user_id)
+        )).mappings().all()
+        tasks = (await primary.execute(
+            select(Task.__table__).where(Task.project_id.in_([p["id"] for p in projects]))
+        )).mappings().all()
+    async with replica_engine.begin() as replica:
+        await replica.execute(insert(User), [dict(row) for row in users])
+        await replica.execute(insert(Project), [dict(row) for row in projects])
+        await replica.execute(insert(Task), [{**row, "title": title} for row in tasks])
+
+
+def use_replica(monkeypatch, replica_engine) -> None:
+    monkeypatch.setattr(
+        database,
+        "ReplicaSessionLocal",
+        async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(replica_router, "_replica_down_until", 0.0)
+
+
+def forget_writes(monkeypatch) -> None:
+    # 書き込み直後の期間（REPLICA_READ_AFTER_WRITE_SECONDS）の経過を再現
+    monkeypatch.setattr(replica_router, "backend", InMemoryCache())
+
+
+@pytest.fixture
+def replica_engine(run, tmp_path):
+    replica = create_engine_for(f"sqlite:///{tmp_path}/replica.db")
+    run(create_schema, replica)
+    yield replica
+    run(replica.dispose)
+
+
+def task_titles(client, headers, project_id):
+    response = client.get(f"/api/v1/project/{project_id}/tasks", headers=headers)
+    assert response.status_code == 200, response.text
+    return [task["title"] for task in response.json()]
+
+
+def test_reads_go_to_replica_and_writes_to_primary(client, headers, project, run, replica_engine, monkeypatch):
+    use_replica(monkeypatch, replica_engine)
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    create_task(client, headers, project["id"], title="primary")
+    run(copy_to_replica, replica_engine, user_id, "replica")
+    
+    # 書き込み直後のユーザーはプライマリを読む
+    assert task_titles(client, headers, project["id"]) == ["primary"]
+    
+    forget_writes(monkeypatch)
+    assert task_titles(client, headers, project["id"]) == ["replica"]
+    
+    # 書き込みはプライマリに行われ、以降の読み取りもプライマリになる
+    create_task(client, headers, project["id"], title="second")
+    assert task_titles(client, headers, project["id"]) == ["primary", "second"]
+
+
+def test_falls_back_to_primary_when_replica_is_unreachable(client, headers, project, tmp_path, run, monkeypatch):
+    create_task(client, headers, project["id"], title="primary")
+    unreachable = create_engine_for(f"sqlite:///{tmp_path}/missing/replica.db")
+    use_replica(monkeypatch, unreachable)
+    forget_writes(monkeypatch)
+    
+    assert task_titles(client, headers, project["id"]) == ["primary"]
+    assert not replica_router.replica_available()
+    run(unreachable.dispose)
+
+
+def test_primary_only_without_replica(client, headers, project, monkeypatch):
+    monkeypatch.setattr(database, "ReplicaSessionLocal", None)
+    forget_writes(monkeypatch)
+    create_task(client, headers, project["id"], title="primary")
+    
+    assert task_titles(client, headers, project["id"]) == ["primary"]
+
+
+def test_multiple_workers_require_shared_cache(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    with pytest.raises(RuntimeError):
+        check_worker_settings()
+    
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "shared")
+    check_worker_settings()
+
+
+def test_writes_are_seen_by_routers_sharing_a_backend(client, headers, project, run, replica_engine, monkeypatch):
+    # 別ワーカーの書き込みも共有バックエンド経由で見え、直後の読み取りはプライマリに向く
+    backend = SharedCache(LocalSharedStore(), "replica")
+    use_replica(monkeypatch, replica_engine)
+    monkeypatch.setattr(replica_router, "backend", backend)
+    other_worker = ReplicaRouter(backend, read_after_write_seconds=5, retry_after_seconds=30)
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    
+    run(other_worker.record_write, user_id)
+    
+    assert run(replica_router.wrote_recently, user_id)
@@ -0,0 +1,114 @@
+"""
+レスポンスキャッシュのテスト（スタンピード防止・書き込みによる無効化）
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.cache import InMemoryCache, LocalSharedStore, SharedCache
+from app.core.response_cache import ResponseCache
+
+USER_ID = 10_000_001
+
+
+def new_cache(backend=None) -> ResponseCache:
+    return ResponseCache(backend or InMemoryCache(), ttl_seconds=60, lock_seconds=5)
+
+
+class SlowCompute:
+    """
+    呼び出し回数を数える遅い計算
+    """
+
+    def __init__(self, value="result", delay=0.05):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = new_cache()
+    compute = SlowCompute()
+    
+    results = await asyncio.gather(*(
+        cache.get_or_compute(USER_ID, "stats", {"a": 1}, compute) for _ in range(20)
+    ))
+    
+    assert results == ["result"] * 20
+    assert compute.calls == 1
+    assert cache.stats()["coalesced"] == 19
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_backend_compute_once():
+    # 共有バックエンドを使う2つのワーカー（別々の ResponseCache）
+    backend = SharedCache(LocalSharedStore(), "response", default_ttl=60)
+    workers = [new_cache(backend), new_cache(backend)]
+    compute = SlowCompute(delay=0.2)
+    
+    results = await asyncio.gather(*(
+        worker.get_or_compute(USER_ID, "stats", {}, compute) for worker in workers
+    ))
+    
+    assert results == ["result", "result"]
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_params_are_normalized_and_none_results_are_not_cached():
+    cache = new_cache()
+    compute = SlowCompute(delay=0)
+    
+    await cache.get_or_compute(USER_ID, "stats", {"breakdown": ["b", "a"], "x": None}, compute)
+    await cache.get_or_compute(USER_ID, "stats", {"breakdown": ["a", "b"]}, compute)
+    assert compute.calls == 1
+    
+    missing = SlowCompute(value=None, delay=0)
+    await cache.get_or_compute(USER_ID, "detail", {}, missing)
+    await cache.get_or_compute(USER_ID, "detail", {}, missing)
+    assert missing.calls == 2
+
+
+def test_writes_invalidate_cached_stats_and_first_page(client, headers):
+    assert client.get("/api/v1/projects/stats", headers=headers).json()["total"] == 0
+    assert client.get("/api/v1/projects/", headers=headers).json() == []
+    
+    created = client.post("/api/v1/projects/", json={"title": "a"}, headers=headers).json()
+    
+    assert client.get("/api/v1/projects/stats", headers=headers).json()["total"] == 1
+    assert [p["id"] for p in client.get("/api/v1/projects/", headers=headers).json()] == [created["id"]]
+    
+    client.put(f"/api/v1/projects/{created['id']}", json={"status": "completed"}, headers=headers)
+    stats = client.get("/api/v1/projects/stats", headers=headers).json()
+    assert (stats["planning"], stats["completed"]) == (0, 1)
+    
+    client.delete(f"/api/v1/projects/{created['id']}", headers=headers)
+    assert client.get("/api/v1/projects/stats", headers=headers).json()["total"] == 0
+    assert client.get("/api/v1/projects/", headers=headers).json() == []
+
+
+def test_reads_during_concurrent_writes_end_consistent(client, headers):
+    def write(i):
+        response = client.post("/api/v1/projects/", json={"title": f"p{i}"}, headers=headers)
+        assert response.status_code == 201, response.text
+    
+    def read(_):
+        client.get("/api/v1/projects/stats", headers=headers)
+        client.get("/api/v1/projects/", headers=headers)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(write if i % 2 else read, i) for i in range(40)]
+        for future in futures:
+            future.result()
+    
+    # 書き込み中に計算された結果が、書き込み後の読み取りに返されない
+    assert client.get("/api/v1/projects/stats", headers=headers).json()["total"] == 20
+    assert len(client.get("/api/v1/projects/", headers=headers).json()) == 20
@@ -0,0 +1,131 @@
+"""
+差分同期のテスト
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models.change_log import ChangeLog
+from app.services import sync as sync_service
+from tests.helpers import auth_headers, create_task
+
+
+def sync(client, headers, since=None):
+    params = {} if since is None else {"since": since}
+    response = client.get("/api/v1/sync/", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_sync_returns_changes_after_token(client, headers, project):
+    token = sync(client, headers)["token"]
+    task = create_task(client, headers, project["id"])
+    
+    changes = sync(client, headers, token)
+    
+    assert [t["id"] for t in changes["tasks"]] == [task["id"]]
+    assert sync(client, headers, changes["token"])["tasks"] == []
+
+
+def test_project_delete_records_cascaded_task_deletes(client, headers, project):
+    tasks = [create_task(client, headers, project["id"]) for _ in range(2)]
+    token = sync(client, headers)["token"]
+    
+    client.delete(f"/api/v1/projects/{project['id']}", headers=headers)
+    changes = sync(client, headers, token)
+    
+    assert changes["deleted"]["projects"] == [project["id"]]
+    assert sorted(changes["deleted"]["tasks"]) == sorted(t["id"] for t in tasks)
+
+
+def create_project(client, headers, title="案件"):
+    response = client.post("/api/v1/projects/", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_token_does_not_include_other_users_changes(client, headers):
+    other = auth_headers(client)
+    create_project(client, headers)
+    token = sync(client, headers)["token"]
+    
+    create_project(client, other)
+    
+    # 他ユーザーの書き込みでトークンが進まない（進むと、それより小さい seq の自分の変更を取りこぼす）
+    assert sync(client, headers)["token"] == token
+
+
+def test_concurrent_writes_of_two_users_are_all_synced(client, headers, run):
+    other = auth_headers(client)
+    token = sync(client, headers)["token"]
+    
+    def write(i):
+        create_project(client, headers if i % 2 else other, f"p{i}")
+        return sync(client, headers)["token"]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tokens = list(pool.map(write, range(40)))
+    
+    # 書き込みの合間に発行したトークンはすべて自分の変更の seq（他ユーザーの seq を渡さない）
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    
+    async def own_seqs():
+        async with SessionLocal() as db:
+            result = await db.execute(select(ChangeLog.seq).where(ChangeLog.user_id == user_id))
+            return {str(seq) for seq in result.scalars()}
+    
+    assert set(tokens) <= run(own_seqs) | {token}
+    
+    mine = {p["id"] for p in client.get("/api/v1/projects/", params={"limit": 100}, headers=headers).json()}
+    assert len(mine) == 20
+    assert {p["id"] for p in sync(client, headers, token)["projects"]} == mine
+
+
+def age_change_log(run, user_id, days):
+    async def age():
+        async with SessionLocal() as db:
+            await db.execute(
+                update(ChangeLog)
+                .where(ChangeLog.user_id == user_id)
+                .values(changed_at=datetime.now(timezone.utc) - timedelta(days=days))
+            )
+            await db.commit()
+    
+    run(age)
+
+
+def prune(run, retention_days):
+    async def prune_log():
+        async with SessionLocal() as db:
+            await sync_service.prune_change_log(db, retention_days)
+    
+    run(prune_log)
+
+
+def test_token_expiry_is_per_user(client, headers, run):
+    active, idle = headers, auth_headers(client)
+    
+    def me(user_headers):
+        return client.get("/api/v1/auth/me", headers=user_headers).json()["id"]
+    
+    create_project(client, active)
+    old_token = sync(client, active)["token"]
+    create_project(client, active)
+    create_project(client, idle)
+    idle_token = sync(client, idle)["token"]
+    
+    age_change_log(run, me(active), 40)
+    age_change_log(run, me(idle), 40)
+    prune(run, 30)
+    
+    # 削除された履歴より前のトークンは期限切れ
+    response = client.get("/api/v1/sync/", params={"since": old_token}, headers=active)
+    assert response.status_code == 410
+    assert client.get("/api/v1/sync/", params={"since": sync(client, active)["token"]}, headers=active).status_code == 200
+    
+    # 変更のないユーザーのトークンは他ユーザーの削除の影響を受けない
+    assert client.get("/api/v1/sync/", params={"since": idle_token}, headers=idle).status_code == 200
+    assert client.get("/api/v1/sync/", params={"since": 0}, headers=auth_headers(client)).status_code == 200
@@ -0,0 +1,86 @@
+"""
+タスク一括操作（/project/{id}/tasks:batch）のテスト
+"""
+
+from tests.helpers import create_task
+
+MISSING_TASK_ID = 999999
+MISSING_USER_ID = 999999
+
+
+def batch(client, headers, project_id, operations, atomic=True):
+    return client.post(
+        f"/api/v1/project/{project_id}/tasks:batch",
+        json={"operations": operations, "atomic": atomic},
+        headers=headers,
+    )
+
+
+def task_titles(client, headers, project_id):
+    response = client.get(f"/api/v1/project/{project_id}/tasks", headers=headers)
+    return sorted(task["title"] for task in response.json())
+
+
+def test_mixed_operations_are_applied_together(client, headers, project):
+    keep = create_task(client, headers, project["id"], title="keep")
+    drop = create_task(client, headers, project["id"], title="drop")
+    
+    response = batch(client, headers, project["id"], [
+        {"op": "create", "data": {"title": "new"}},
+        {"op": "update", "id": keep["id"], "data": {"title": "kept", "status": "completed"}},
+        {"op": "delete", "id": drop["id"]},
+    ])
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["applied"] is True
+    assert [r["status"] for r in body["results"]] == [201, 200, 204]
+    assert task_titles(client, headers, project["id"]) == ["kept", "new"]
+    counts = client.get(f"/api/v1/projects/{project['id']}", headers=headers).json()
+    assert (counts["task_total"], counts["task_completed"]) == (2, 1)
+
+
+def test_atomic_batch_applies_nothing_when_one_operation_fails(client, headers, project):
+    response = batch(client, headers, project["id"], [
+        {"op": "create", "data": {"title": "a"}},
+        {"op": "delete", "id": MISSING_TASK_ID},
+    ])
+    
+    assert response.status_code == 400
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [424, 404]
+    assert results[0]["id"] is None
+    assert task_titles(client, headers, project["id"]) == []
+
+
+def test_partial_batch_applies_valid_operations(client, headers, project):
+    response = batch(client, headers, project["id"], [
+        {"op": "create", "data": {"title": "a"}},
+        {"op": "create", "data": {"title": ""}},
+        {"op": "update", "id": MISSING_TASK_ID, "data": {"title": "x"}},
+        {"op": "create", "data": {"title": "b"}},
+    ], atomic=False)
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert [r["status"] for r in body["results"]] == [201, 422, 404, 201]
+    assert task_titles(client, headers, project["id"]) == ["a", "b"]
+
+
+def test_partial_batch_isolates_database_errors_per_item(client, headers, project):
+    # 存在しない担当者は外部キー違反（DBエラー）になる
+    response = batch(client, headers, project["id"], [
+        {"op": "create", "data": {"title": "a"}},
+        {"op": "create", "data": {"title": "bad", "assigned_to": MISSING_USER_ID}},
+        {"op": "create", "data": {"title": "c"}},
+    ], atomic=False)
+    
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [201, 400, 201]
+    assert results[1]["error"].startswith("データベースエラー")
+    assert results[1]["id"] is None
+    assert task_titles(client, headers, project["id"]) == ["a", "c"]
+    counts = client.get(f"/api/v1/projects/{project['id']}", headers=headers).json()
+    assert counts["task_total"] == 2
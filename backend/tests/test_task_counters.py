@@ -0,0 +1,53 @@
+"""
+案件のタスク件数カウンタのテスト
+"""
+
+from sqlalchemy import update
+
+from app.core.etag import data_versions
+from app.database import SessionLocal
+from app.models.project import Project
+from app.services.task_counters import reconcile_task_counters
+from tests.helpers import create_task
+
+
+def user_id_of(client, headers) -> int:
+    return client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+
+def test_counters_follow_task_writes(client, headers, project):
+    task = create_task(client, headers, project["id"], status="todo")
+    client.put(f"/api/v1/tasks/{task['id']}", json={"status": "completed"}, headers=headers)
+    create_task(client, headers, project["id"], status="todo")
+    
+    detail = client.get(f"/api/v1/projects/{project['id']}", headers=headers).json()
+    assert (detail["task_total"], detail["task_todo"], detail["task_completed"]) == (2, 1, 1)
+
+
+def test_reconcile_repairs_drift_and_bumps_owner_version(client, headers, project, run):
+    create_task(client, headers, project["id"], status="todo")
+    user_id = user_id_of(client, headers)
+    
+    async def drift_and_reconcile():
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Project).where(Project.id == project["id"]).values(task_total=99, task_todo=0)
+            )
+            await db.commit()
+            before = await data_versions.get(user_id)
+            repaired = await reconcile_task_counters(db, [project["id"]])
+            return repaired, before, await data_versions.get(user_id)
+    
+    repaired, before, after = run(drift_and_reconcile)
+    
+    assert repaired == 1
+    assert after > before
+    detail = client.get(f"/api/v1/projects/{project['id']}", headers=headers).json()
+    assert (detail["task_total"], detail["task_todo"]) == (1, 1)
+    
+    # ずれがなければ修復もバージョンの更新もしない
+    async def reconcile_again():
+        async with SessionLocal() as db:
+            return await reconcile_task_counters(db, [project["id"]]), await data_versions.get(user_id)
+    
+    assert run(reconcile_again) == (0, after)